@@ -1,14 +1,28 @@
 """LangConnect: A RAG service using FastAPI and LangChain."""
 
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 import dotenv
 
 __version__ = "0.0.1"
 
 dotenv.load_dotenv()
+
+# Request handlers only enqueue log records; the listener thread applies the
+# output format and does the blocking write to stderr.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(
+    logging.Formatter(
+        "%(asctime)s %(levelname)s %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
+    )
+)
+_log_listener = QueueListener(_log_queue, _log_handler, respect_handler_level=True)
 logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)s %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
+    level=logging.INFO, format="%(message)s", handlers=[QueueHandler(_log_queue)]
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
@@ -1,10 +1,10 @@
 """Authentication API endpoints."""
 
-from datetime import timedelta
+import asyncio
 from typing import Annotated
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
 from ragbackend import config
@@ -12,6 +12,7 @@ from ragbackend.schemas.users import UserCreate, UserResponse, Token, UserLogin
 from ragbackend.services.jwt_service import (
     create_access_token,
     get_password_hash,
+    password_needs_rehash,
     verify_password,
 )
 from ragbackend.database.users import (
@@ -19,6 +20,7 @@ from ragbackend.database.users import (
     get_user_by_username,
     get_user_by_email,
     update_user_last_login,
+    update_user_password_hash,
     create_users_table,
 )
 
@@ -41,6 +43,12 @@ def _convert_db_user_to_response(db_user: dict) -> dict:
     return converted_user
 
 
+async def _upgrade_password_hash(user_id: str, password: str) -> None:
+    """Re-hash a verified password with the current scheme and store it."""
+    hashed_password = await asyncio.to_thread(get_password_hash, password)
+    await update_user_password_hash(user_id, hashed_password)
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(user: UserCreate):
     """Register a new user."""
@@ -60,7 +68,7 @@ async def register(user: UserCreate):
         )
     
     # Hash password and create user
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await asyncio.to_thread(get_password_hash, user.password)
     db_user = await create_user(
         email=user.email,
         username=user.username,
@@ -74,11 +82,13 @@ async def register(user: UserCreate):
 
 
 @router.post("/login", response_model=Token)
-async def login(user_data: UserLogin):
+async def login(user_data: UserLogin, background_tasks: BackgroundTasks):
     """Login user and return access token."""
     user = await get_user_by_username(user_data.username)
     
-    if not user or not verify_password(user_data.password, user["hashed_password"]):
+    if not user or not await asyncio.to_thread(
+        verify_password, user_data.password, user["hashed_password"]
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -91,32 +101,40 @@ async def login(user_data: UserLogin):
             detail="User account is inactive"
         )
     
-    # Update last login - convert UUID to string for database operations
+    # Update last login - convert UUID to string for database operations.
+    # Nothing in the response depends on it, so it runs after the response
+    # is sent instead of adding a round-trip to every login.
     user_id = str(user["id"]) if isinstance(user["id"], uuid.UUID) else user["id"]
-    await update_user_last_login(user_id)
+    background_tasks.add_task(update_user_last_login, user_id)
+
+    # Upgrade legacy bcrypt hashes now that the plain password is known
+    if password_needs_rehash(user["hashed_password"]):
+        background_tasks.add_task(_upgrade_password_hash, user_id, user_data.password)
     
     # Create access token
-    access_token_expires = timedelta(minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user_id, "username": user["username"]},
-        expires_delta=access_token_expires
+        expires_delta=config.ACCESS_TOKEN_EXPIRE_DELTA
     )
     
     return Token(
         access_token=access_token,
         token_type="bearer",
-        expires_in=config.ACCESS_TOKEN_EXPIRE_MINUTES * 60  # Convert to seconds
+        expires_in=config.ACCESS_TOKEN_EXPIRE_SECONDS
     )
 
 
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
-    form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    background_tasks: BackgroundTasks,
 ):
     """OAuth2 compatible token login (for interactive API docs)."""
     user = await get_user_by_username(form_data.username)
     
-    if not user or not verify_password(form_data.password, user["hashed_password"]):
+    if not user or not await asyncio.to_thread(
+        verify_password, form_data.password, user["hashed_password"]
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -129,19 +147,24 @@ async def login_for_access_token(
             detail="User account is inactive"
         )
     
-    # Update last login - convert UUID to string for database operations
+    # Update last login - convert UUID to string for database operations.
+    # Nothing in the response depends on it, so it runs after the response
+    # is sent instead of adding a round-trip to every login.
     user_id = str(user["id"]) if isinstance(user["id"], uuid.UUID) else user["id"]
-    await update_user_last_login(user_id)
+    background_tasks.add_task(update_user_last_login, user_id)
+
+    # Upgrade legacy bcrypt hashes now that the plain password is known
+    if password_needs_rehash(user["hashed_password"]):
+        background_tasks.add_task(_upgrade_password_hash, user_id, form_data.password)
     
     # Create access token
-    access_token_expires = timedelta(minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user_id, "username": user["username"]},
-        expires_delta=access_token_expires
+        expires_delta=config.ACCESS_TOKEN_EXPIRE_DELTA
     )
     
     return Token(
         access_token=access_token,
         token_type="bearer",
-        expires_in=config.ACCESS_TOKEN_EXPIRE_MINUTES * 60  # Convert to seconds
+        expires_in=config.ACCESS_TOKEN_EXPIRE_SECONDS
     ) 
\ No newline at end of file
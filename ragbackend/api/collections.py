@@ -1,15 +1,34 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
 
 from ragbackend.auth import AuthenticatedUser, resolve_user
 from ragbackend.database.collections import CollectionsManager
 from ragbackend.schemas import CollectionCreate, CollectionResponse, CollectionUpdate
 
+# Built once; validates and serializes a whole listing in single pydantic-core
+# calls, which beats building each model in a Python loop
+_collections_adapter = TypeAdapter(list[CollectionResponse])
+
 router = APIRouter(prefix="/collections", tags=["collections"])
 
 
+def get_collections_manager(
+    user: Annotated[AuthenticatedUser, Depends(resolve_user)],
+) -> CollectionsManager:
+    """Provide a CollectionsManager scoped to the authenticated user.
+
+    FastAPI caches dependencies per request, so routes that also take the
+    user still resolve it only once.
+    """
+    return CollectionsManager(user.identity)
+
+
+CollectionsManagerDep = Annotated[CollectionsManager, Depends(get_collections_manager)]
+
+
 @router.post(
     "",
     response_model=CollectionResponse,
@@ -17,58 +36,67 @@ router = APIRouter(prefix="/collections", tags=["collections"])
 )
 async def collections_create(
     collection_data: CollectionCreate,
-    user: Annotated[AuthenticatedUser, Depends(resolve_user)],
+    manager: CollectionsManagerDep,
 ):
     """Creates a new PGVector collection by name with optional metadata."""
-    collection_info = await CollectionsManager(user.identity).create_collection(
+    collection_info = await manager.create_collection(
         collection_data.name, collection_data.metadata
     )
     if not collection_info:
         raise HTTPException(status_code=500, detail="Failed to create collection")
-    return CollectionResponse(**collection_info)
+    return CollectionResponse.from_row(collection_info)
 
 
 @router.get("", response_model=list[CollectionResponse])
-async def collections_list(user: Annotated[AuthenticatedUser, Depends(resolve_user)]):
+async def collections_list(
+    manager: CollectionsManagerDep,
+    limit: int | None = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+    summary: bool = Query(False),
+):
     """Lists all available PGVector collections (name and UUID)."""
-    return [
-        CollectionResponse(**c) for c in await CollectionsManager(user.identity).list_collections()
-    ]
+    collections = _collections_adapter.validate_python(
+        await manager.list_collections(limit=limit, offset=offset, summary=summary)
+    )
+    return Response(
+        content=_collections_adapter.dump_json(collections),
+        media_type="application/json",
+    )
 
 
 @router.get("/{collection_id}", response_model=CollectionResponse)
 async def collections_get(
-    user: Annotated[AuthenticatedUser, Depends(resolve_user)],
+    manager: CollectionsManagerDep,
     collection_id: UUID,
 ):
     """Retrieves details (name and UUID) of a specific PGVector collection."""
-    collection = await CollectionsManager(user.identity).get_collection(str(collection_id))
+    collection = await manager.get_collection(str(collection_id))
     if not collection:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Collection '{collection_id}' not found",
         )
-    return CollectionResponse(**collection.details)
+    return CollectionResponse.from_row(collection.details)
 
 
 @router.delete("/{collection_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def collections_delete(
-    user: Annotated[AuthenticatedUser, Depends(resolve_user)],
+    manager: CollectionsManagerDep,
     collection_id: UUID,
 ):
     """Deletes a specific PGVector collection by name."""
-    await CollectionsManager(user.identity).delete_collection(str(collection_id), user.identity)
+    await manager.delete_collection(str(collection_id), manager.user_id)
     return "Collection deleted successfully."
 
 
 @router.patch("/{collection_id}", response_model=CollectionResponse)
 async def collections_update(
-    user: Annotated[AuthenticatedUser, Depends(resolve_user)],
+    manager: CollectionsManagerDep,
     collection_id: UUID,
     collection_data: CollectionUpdate,
 ):
     """Updates a specific PGVector collection's name and/or metadata."""
-    updated_collection = await CollectionsManager(user.identity).update_collection(
+    updated_collection = await manager.update_collection(
         str(collection_id),
         name=collection_data.name,
         metadata=collection_data.metadata,
@@ -80,4 +108,4 @@ async def collections_update(
             detail=f"Failed to update collection '{collection_id}'",
         )
 
-    return CollectionResponse(**updated_collection)
+    return CollectionResponse.from_row(updated_collection)
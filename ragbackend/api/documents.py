@@ -1,11 +1,26 @@
+import asyncio
 import logging
+from collections.abc import AsyncIterator
 from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+import orjson
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
 from langchain_core.documents import Document
 from pydantic import TypeAdapter, ValidationError
 
+from ragbackend import config
+from ragbackend.api.collections import CollectionsManagerDep
+from ragbackend.api.responses import OrjsonResponse
 from ragbackend.auth import AuthenticatedUser, resolve_user
 from ragbackend.database.collections import Collection
 from ragbackend.schemas import DocumentResponse, SearchQuery, SearchResult
@@ -52,35 +67,47 @@ async def documents_create(
     processed_files_count = 0
     failed_files = []
 
-    # Pair files with their corresponding metadata
-    for file, metadata in zip(files, metadatas, strict=False):
-        try:
+    # Process files concurrently, with at most INGEST_CONCURRENCY in flight so
+    # a large batch can't exhaust memory, parser workers or MinIO connections.
+    semaphore = asyncio.Semaphore(config.INGEST_CONCURRENCY)
+
+    async def process(file: UploadFile, metadata: dict | None) -> list[Document]:
+        async with semaphore:
             # Pass metadata to process_document with MinIO storage enabled
-            langchain_docs, file_metadata = await process_document(
-                file, 
+            langchain_docs, _ = await process_document(
+                file,
                 metadata=metadata,
                 user_id=user.identity,
                 collection_id=str(collection_id),
-                store_original=True
+                store_original=True,
             )
-            if langchain_docs:
-                docs_to_index.extend(langchain_docs)
-                processed_files_count += 1
-                logger.info(f"Successfully processed file {file.filename} with {len(langchain_docs)} document chunks")
-            else:
-                logger.info(
-                    f"Warning: File {file.filename} resulted "
-                    f"in no processable documents."
-                )
-                # Decide if this constitutes a failure
-                # failed_files.append(file.filename)
-
-        except Exception as proc_exc:
+            return langchain_docs
+
+    results = await asyncio.gather(
+        *(
+            process(file, metadata)
+            for file, metadata in zip(files, metadatas, strict=False)
+        ),
+        return_exceptions=True,
+    )
+
+    # Pair files with their results, keeping the upload order
+    for file, result in zip(files, results, strict=False):
+        if isinstance(result, Exception):
             # Log the error and the file that caused it
-            logger.info(f"Error processing file {file.filename}: {proc_exc}")
+            logger.error("Error processing file %s: %s", file.filename, result)
             failed_files.append(file.filename)
-            # Decide on behavior: continue processing others or fail fast?
-            # For now, let's collect failures and report them, but continue processing.
+            # Collect failures and report them, but keep the other files.
+        elif result:
+            docs_to_index.extend(result)
+            processed_files_count += 1
+            logger.info("Successfully processed file %s with %s document chunks", file.filename, len(result))
+        else:
+            logger.warning(
+                "File %s resulted in no processable documents.", file.filename
+            )
+            # Decide if this constitutes a failure
+            # failed_files.append(file.filename)
 
     # If after processing all files, none yielded documents, raise error
     if not docs_to_index:
@@ -128,7 +155,7 @@ async def documents_create(
         raise http_exc
     except Exception as add_exc:
         # Handle exceptions during the vector store addition process
-        logger.info(f"Error adding documents to vector store: {add_exc}")
+        logger.error("Error adding documents to vector store: %s", add_exc)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to add documents to vector store: {add_exc!s}",
@@ -149,7 +176,49 @@ async def documents_list(
         collection_id=str(collection_id),
         user_id=user.identity,
     )
-    return await collection.list(limit=limit, offset=offset)
+    # Rows are plain dicts already in the DocumentResponse shape; orjson
+    # serializes them, timestamps included, without a model per row.
+    return OrjsonResponse(await collection.list(limit=limit, offset=offset))
+
+
+async def _ndjson_lines(chunks: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    """Encode each chunk as one JSON line as soon as it is read."""
+    async for chunk in chunks:
+        yield orjson.dumps(chunk, option=orjson.OPT_APPEND_NEWLINE)
+
+
+@router.get(
+    "/collections/{collection_id}/documents/chunks",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def documents_chunks(
+    manager: CollectionsManagerDep,
+    collection_id: UUID,
+    limit: int | None = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+    after_id: UUID | None = Query(None),
+):
+    """Streams the indexed chunks of a collection as newline-delimited JSON.
+
+    Rows are read through a database cursor and written out one line at a
+    time, so the first chunk is sent immediately and memory use doesn't grow
+    with the size of the collection. Chunks are ordered by id; pass the last
+    id received as ``after_id`` to fetch the next page without an offset scan.
+    """
+    # Resolve the collection up front so a missing one is still a 404; errors
+    # can't change the status code once streaming has started.
+    collection = await manager.get_collection(str(collection_id))
+    return StreamingResponse(
+        _ndjson_lines(
+            collection.iter_document_dicts(
+                limit=limit,
+                offset=offset,
+                after_id=str(after_id) if after_id else None,
+            )
+        ),
+        media_type="application/x-ndjson",
+    )
 
 
 @router.delete(
@@ -196,4 +265,6 @@ async def documents_search(
         search_query.query,
         limit=search_query.limit or 10,
     )
-    return results
+    # Results are plain dicts already in the SearchResult shape; serialize them
+    # directly instead of building and re-validating a model per hit.
+    return OrjsonResponse(results)
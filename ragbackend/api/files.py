@@ -5,20 +5,46 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Response, Query
 from fastapi.responses import StreamingResponse
 
+from ragbackend.api.responses import OrjsonResponse
 from ragbackend.auth import AuthenticatedUser, resolve_user
-from ragbackend.services.minio_service import get_minio_service
+from ragbackend.services.minio_service import get_minio_service, iter_object
 from ragbackend.database.files import (
-    get_file_metadata,
+    get_file_metadata_for_user,
     get_files_by_collection,
     get_files_by_user,
     get_file_count_by_collection,
     get_total_file_size_by_user,
-    delete_file_metadata
+    delete_file_metadata_for_user
 )
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/files", tags=["files"])
+# These routes return plain dicts without a response model, so FastAPI's
+# pydantic-core serialization fast path doesn't apply; render them with orjson.
+router = APIRouter(
+    prefix="/files", tags=["files"], default_response_class=OrjsonResponse
+)
+
+# Fields of a file_storage row exposed by the list endpoints
+_LIST_FIELDS = (
+    "file_id",
+    "collection_id",
+    "filename",
+    "original_filename",
+    "content_type",
+    "file_size",
+    "object_path",
+    "upload_time",
+    "created_at",
+)
+
+
+def _list_entries(files: list[dict]) -> list[dict]:
+    """Project file rows onto the listed fields.
+
+    Datetimes are left as they are; orjson writes them in ISO 8601 itself.
+    """
+    return [{field: record[field] for field in _LIST_FIELDS} for record in files]
 
 
 @router.get("/collections/{collection_id}/files")
@@ -37,31 +63,15 @@ async def list_collection_files(
             offset=offset
         )
         
-        # Format response
-        formatted_files = []
-        for file_record in files:
-            formatted_file = {
-                "file_id": file_record['file_id'],
-                "collection_id": str(collection_id),
-                "filename": file_record['filename'],
-                "original_filename": file_record['original_filename'],
-                "content_type": file_record['content_type'],
-                "file_size": file_record['file_size'],
-                "object_path": file_record['object_path'],
-                "upload_time": file_record['upload_time'].isoformat() if file_record['upload_time'] else None,
-                "created_at": file_record['created_at'].isoformat() if file_record['created_at'] else None
-            }
-            formatted_files.append(formatted_file)
-        
-        return {
-            "files": formatted_files,
-            "total": len(formatted_files),
+        return OrjsonResponse({
+            "files": _list_entries(files),
+            "total": len(files),
             "limit": limit,
             "offset": offset
-        }
+        })
         
     except Exception as e:
-        logger.error(f"Error listing files for collection {collection_id}: {e}")
+        logger.error("Error listing files for collection %s: %s", collection_id, e)
         raise HTTPException(status_code=500, detail="Failed to list files")
 
 
@@ -79,31 +89,15 @@ async def list_user_files(
             offset=offset
         )
         
-        # Format response
-        formatted_files = []
-        for file_record in files:
-            formatted_file = {
-                "file_id": file_record['file_id'],
-                "collection_id": file_record['collection_id'],
-                "filename": file_record['filename'],
-                "original_filename": file_record['original_filename'],
-                "content_type": file_record['content_type'],
-                "file_size": file_record['file_size'],
-                "object_path": file_record['object_path'],
-                "upload_time": file_record['upload_time'].isoformat() if file_record['upload_time'] else None,
-                "created_at": file_record['created_at'].isoformat() if file_record['created_at'] else None
-            }
-            formatted_files.append(formatted_file)
-        
-        return {
-            "files": formatted_files,
-            "total": len(formatted_files),
+        return OrjsonResponse({
+            "files": _list_entries(files),
+            "total": len(files),
             "limit": limit,
             "offset": offset
-        }
+        })
         
     except Exception as e:
-        logger.error(f"Error listing files for user {user.identity}: {e}")
+        logger.error("Error listing files for user %s: %s", user.identity, e)
         raise HTTPException(status_code=500, detail="Failed to list files")
 
 
@@ -122,7 +116,7 @@ async def get_collection_file_stats(
         }
         
     except Exception as e:
-        logger.error(f"Error getting stats for collection {collection_id}: {e}")
+        logger.error("Error getting stats for collection %s: %s", collection_id, e)
         raise HTTPException(status_code=500, detail="Failed to get file statistics")
 
 
@@ -141,7 +135,7 @@ async def get_user_file_stats(
         }
         
     except Exception as e:
-        logger.error(f"Error getting stats for user {user.identity}: {e}")
+        logger.error("Error getting stats for user %s: %s", user.identity, e)
         raise HTTPException(status_code=500, detail="Failed to get file statistics")
 
 
@@ -152,15 +146,12 @@ async def get_file_info(
 ):
     """Get detailed information about a specific file."""
     try:
-        file_metadata = await get_file_metadata(file_id)
+        # Files owned by other users are reported as missing
+        file_metadata = await get_file_metadata_for_user(file_id, user.identity)
         
         if not file_metadata:
             raise HTTPException(status_code=404, detail="File not found")
         
-        # Check if user owns this file
-        if file_metadata['user_id'] != user.identity:
-            raise HTTPException(status_code=403, detail="Access denied")
-        
         # Get MinIO file info
         minio_service = get_minio_service()
         minio_info = await minio_service.get_file_info(file_metadata['object_path'])
@@ -192,7 +183,7 @@ async def get_file_info(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting file info for {file_id}: {e}")
+        logger.error("Error getting file info for %s: %s", file_id, e)
         raise HTTPException(status_code=500, detail="Failed to get file information")
 
 
@@ -203,32 +194,30 @@ async def download_file(
 ):
     """Download a file from MinIO."""
     try:
-        file_metadata = await get_file_metadata(file_id)
+        # Files owned by other users are reported as missing
+        file_metadata = await get_file_metadata_for_user(file_id, user.identity)
         
         if not file_metadata:
             raise HTTPException(status_code=404, detail="File not found")
         
-        # Check if user owns this file
-        if file_metadata['user_id'] != user.identity:
-            raise HTTPException(status_code=403, detail="Access denied")
-        
         # Get file from MinIO
         minio_service = get_minio_service()
         file_stream = await minio_service.download_file(file_metadata['object_path'])
         
         # Return streaming response
         return StreamingResponse(
-            file_stream,
+            iter_object(file_stream),
             media_type=file_metadata['content_type'] or 'application/octet-stream',
             headers={
-                "Content-Disposition": f"attachment; filename=\"{file_metadata['original_filename']}\""
+                "Content-Disposition": f"attachment; filename=\"{file_metadata['original_filename']}\"",
+                "Content-Length": str(file_metadata['file_size'])
             }
         )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error downloading file {file_id}: {e}")
+        logger.error("Error downloading file %s: %s", file_id, e)
         raise HTTPException(status_code=500, detail="Failed to download file")
 
 
@@ -240,15 +229,12 @@ async def get_download_url(
 ):
     """Generate a presigned download URL for a file."""
     try:
-        file_metadata = await get_file_metadata(file_id)
+        # Files owned by other users are reported as missing
+        file_metadata = await get_file_metadata_for_user(file_id, user.identity)
         
         if not file_metadata:
             raise HTTPException(status_code=404, detail="File not found")
         
-        # Check if user owns this file
-        if file_metadata['user_id'] != user.identity:
-            raise HTTPException(status_code=403, detail="Access denied")
-        
         # Generate presigned URL
         from datetime import timedelta
         minio_service = get_minio_service()
@@ -267,7 +253,7 @@ async def get_download_url(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error generating download URL for {file_id}: {e}")
+        logger.error("Error generating download URL for %s: %s", file_id, e)
         raise HTTPException(status_code=500, detail="Failed to generate download URL")
 
 
@@ -278,22 +264,17 @@ async def delete_file(
 ):
     """Delete a file and all associated documents."""
     try:
-        file_metadata = await get_file_metadata(file_id)
+        # Ownership check and metadata delete in a single round-trip; files
+        # owned by other users are reported as missing
+        file_metadata = await delete_file_metadata_for_user(file_id, user.identity)
         
         if not file_metadata:
             raise HTTPException(status_code=404, detail="File not found")
         
-        # Check if user owns this file
-        if file_metadata['user_id'] != user.identity:
-            raise HTTPException(status_code=403, detail="Access denied")
-        
         # Delete from MinIO
         minio_service = get_minio_service()
         minio_deleted = await minio_service.delete_file(file_metadata['object_path'])
         
-        # Delete file metadata
-        metadata_deleted = await delete_file_metadata(file_id)
-        
         # TODO: Also delete associated documents from vector store
         # This would require integration with the Collection class
         
@@ -302,11 +283,11 @@ async def delete_file(
             "message": f"File {file_metadata['original_filename']} deleted successfully",
             "file_id": file_id,
             "minio_deleted": minio_deleted,
-            "metadata_deleted": metadata_deleted
+            "metadata_deleted": True
         }
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deleting file {file_id}: {e}")
+        logger.error("Error deleting file %s: %s", file_id, e)
         raise HTTPException(status_code=500, detail="Failed to delete file") 
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""Response classes shared by the API routers."""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Returning an instance directly from a route skips FastAPI's response model
+    validation and serialization, so only use it for payloads the service has
+    built itself in the documented shape.
+
+    Don't make it an app-wide ``default_response_class``: for routes with a
+    response model FastAPI then gives up serializing straight to JSON bytes
+    through pydantic-core, which is faster than any Python-side encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -1,5 +1,9 @@
 """Auth to resolve user object."""
 
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
 from typing import Annotated
 
 from fastapi import Depends
@@ -13,6 +17,52 @@ from ragbackend.database.users import get_user_by_id
 
 security = HTTPBearer()
 
+# Bearer tokens accepted as-is when IS_TESTING is set
+_TEST_USERS: frozenset[str] = frozenset({"user1", "user2"})
+
+# Users resolved from recently seen tokens, least recently used first, keyed by
+# a digest of the token. Entries live for AUTH_CACHE_TTL seconds and never past
+# the token's own expiry, so an active session hits the database about once
+# per TTL instead of on every request; deactivating a user takes effect within
+# the same window.
+_USER_CACHE_SIZE = 10_000
+_user_cache: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _cache_user(key: bytes, payload: dict, user: dict) -> None:
+    ttl = float(config.AUTH_CACHE_TTL)
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl <= 0:
+        return
+    _user_cache[key] = (time.monotonic() + ttl, user)
+    if len(_user_cache) > _USER_CACHE_SIZE:
+        _user_cache.popitem(last=False)
+
+
+# User lookups in flight, so concurrent requests for one user share a query
+_user_lookups: dict[str, asyncio.Task] = {}
+
+
+async def _get_user_coalesced(user_id: str) -> dict | None:
+    """Fetch a user by ID, joining an identical lookup already in flight."""
+    task = _user_lookups.get(user_id)
+    if task is None:
+        task = asyncio.ensure_future(get_user_by_id(user_id))
+        _user_lookups[user_id] = task
+        task.add_done_callback(lambda _: _user_lookups.pop(user_id, None))
+    # Shield the shared lookup so one cancelled request doesn't fail the others
+    return await asyncio.shield(task)
+
+
+def clear_user_cache() -> None:
+    """Forget every cached token-to-user resolution."""
+    _user_cache.clear()
+
 
 class AuthenticatedUser(BaseUser):
     """An authenticated user following the Starlette authentication model."""
@@ -58,6 +108,20 @@ async def get_current_user(authorization: str) -> dict:
     Raises:
         HTTPException: With status code 401 if token is invalid or authentication fails
     """
+    # Anything that isn't header.payload.signature can't verify; reject it
+    # before hashing or decoding so junk tokens stay cheap
+    if authorization.count(".") != 2:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    key = _token_cache_key(authorization)
+    cached = _user_cache.get(key)
+    if cached is not None:
+        expires_at, user = cached
+        if expires_at > time.monotonic():
+            _user_cache.move_to_end(key)
+            return user
+        del _user_cache[key]
+
     payload = verify_token(authorization)
     if not payload:
         raise HTTPException(status_code=401, detail="Invalid token")
@@ -66,13 +130,14 @@ async def get_current_user(authorization: str) -> dict:
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token payload")
     
-    user = await get_user_by_id(user_id)
+    user = await _get_user_coalesced(user_id)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     
     if not user.get("is_active"):
         raise HTTPException(status_code=401, detail="User account is inactive")
-    
+
+    _cache_user(key, payload, user)
     return user
 
 
@@ -87,7 +152,7 @@ async def resolve_user(
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     if config.IS_TESTING:
-        if credentials.credentials in {"user1", "user2"}:
+        if credentials.credentials in _TEST_USERS:
             return AuthenticatedUser(credentials.credentials, credentials.credentials)
         raise HTTPException(
             status_code=401, detail="Invalid credentials or user not found"
@@ -1,8 +1,13 @@
-import json
+import functools
+import logging
+from datetime import timedelta
 
+import orjson
 from langchain_core.embeddings import Embeddings
 from starlette.config import Config, undefined
 
+logger = logging.getLogger(__name__)
+
 env = Config()
 
 IS_TESTING = env("IS_TESTING", cast=str, default="").lower() == "true"
@@ -11,11 +16,44 @@ IS_TESTING = env("IS_TESTING", cast=str, default="").lower() == "true"
 SECRET_KEY = env("SECRET_KEY", cast=str, default="your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = env("ACCESS_TOKEN_EXPIRE_MINUTES", cast=int, default=60 * 24 * 7)  # 7 days
+ACCESS_TOKEN_EXPIRE_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+ACCESS_TOKEN_EXPIRE_DELTA = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+# Seconds a resolved bearer token's user is cached in memory (0 disables)
+AUTH_CACHE_TTL = env("AUTH_CACHE_TTL", cast=int, default=60)
 
 # Silicon Flow Configuration
 SILICONFLOW_API_KEY = env("SILICONFLOW_API_KEY", cast=str, default="")
 SILICONFLOW_BASE_URL = env("SILICONFLOW_BASE_URL", cast=str, default="https://api.siliconflow.cn/v1")
 SILICONFLOW_MODEL = env("SILICONFLOW_MODEL", cast=str, default="BAAI/bge-m3")
+EMBEDDINGS_MAX_CONNECTIONS = env("EMBEDDINGS_MAX_CONNECTIONS", cast=int, default=100)
+# Texts per embedding request when ingesting, and how many such requests one
+# upload may have in flight at once
+EMBED_BATCH_SIZE = env("EMBED_BATCH_SIZE", cast=int, default=128)
+EMBED_MAX_CONCURRENT_BATCHES = env("EMBED_MAX_CONCURRENT_BATCHES", cast=int, default=4)
+# Milliseconds concurrent search queries are collected for before they are
+# embedded with one request (0 embeds each query on its own)
+SEARCH_BATCH_WINDOW_MS = env("SEARCH_BATCH_WINDOW_MS", cast=float, default=5)
+# Recent unfiltered search results kept per collection and reused for queries
+# whose embedding has at least this cosine similarity to a cached one; cached
+# results live for SEMANTIC_CACHE_TTL seconds (a size or TTL of 0 disables).
+# Writes only clear the cache of the worker that made them; with several
+# workers, the others can return deleted or changed chunks for up to the TTL.
+SEMANTIC_CACHE_SIZE = env("SEMANTIC_CACHE_SIZE", cast=int, default=256)
+SEMANTIC_CACHE_THRESHOLD = env("SEMANTIC_CACHE_THRESHOLD", cast=float, default=0.97)
+SEMANTIC_CACHE_TTL = env("SEMANTIC_CACHE_TTL", cast=float, default=60)
+
+
+def _embeddings_http_async_client():
+    """Build the pooled HTTP client shared by all embedding requests."""
+    import httpx
+
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=EMBEDDINGS_MAX_CONNECTIONS,
+            max_keepalive_connections=EMBEDDINGS_MAX_CONNECTIONS,
+        ),
+        timeout=httpx.Timeout(60.0, connect=5.0),
+    )
 
 
 def get_embeddings() -> Embeddings:
@@ -28,35 +66,59 @@ def get_embeddings() -> Embeddings:
     if SILICONFLOW_API_KEY:
         try:
             from langchain_openai import OpenAIEmbeddings
+            # bge-m3 is not an OpenAI model; skip the tiktoken based length
+            # check, which would otherwise load a BPE table per process.
             return OpenAIEmbeddings(
                 api_key=SILICONFLOW_API_KEY,
                 base_url=SILICONFLOW_BASE_URL,
                 model=SILICONFLOW_MODEL,
+                check_embedding_ctx_length=False,
+                http_async_client=_embeddings_http_async_client(),
             )
         except ImportError:
-            print("Warning: langchain_openai not available, falling back to OpenAI")
+            logger.warning("langchain_openai not available, falling back to OpenAI")
     
     # 回退到OpenAI
     try:
         from langchain_openai import OpenAIEmbeddings
-        return OpenAIEmbeddings()
+        return OpenAIEmbeddings(http_async_client=_embeddings_http_async_client())
     except ImportError:
         # Fallback to fake embedding if OpenAI is not available
         from langchain_core.embeddings import DeterministicFakeEmbedding
         return DeterministicFakeEmbedding(size=512)
 
 
-# Initialize embeddings lazily to avoid import errors
-DEFAULT_EMBEDDINGS = None
+# Initialize embeddings lazily to avoid import errors and so processes that
+# never embed anything don't build the client at startup
+@functools.cache
+def get_default_embeddings() -> Embeddings:
+    """Get the default embeddings instance, initializing it on first use.
+
+    The same instance is returned on every call; vector stores are cached by
+    its identity.
+    """
+    return get_embeddings()
 
 
-def get_default_embeddings() -> Embeddings:
-    """Get the default embeddings instance, initializing if needed."""
-    global DEFAULT_EMBEDDINGS
-    if DEFAULT_EMBEDDINGS is None:
-        DEFAULT_EMBEDDINGS = get_embeddings()
-    return DEFAULT_EMBEDDINGS
 DEFAULT_COLLECTION_NAME = "default_collection"
+# Seconds a collection's details are cached in memory (0 disables)
+COLLECTION_CACHE_TTL = env("COLLECTION_CACHE_TTL", cast=int, default=60)
+
+# Number of processes used to parse and split uploaded documents
+# (0 uses one per CPU core)
+PARSE_WORKERS = env("PARSE_WORKERS", cast=int, default=0)
+
+# Maximum number of uploaded files processed concurrently per request
+INGEST_CONCURRENCY = env("INGEST_CONCURRENCY", cast=int, default=4)
+
+# Directory caching parsed upload chunks, keyed by content hash (empty disables)
+INGEST_CACHE_PATH = env("INGEST_CACHE_PATH", cast=str, default="")
+# Size the ingest cache directory is trimmed to, in megabytes
+INGEST_CACHE_MAX_MB = env("INGEST_CACHE_MAX_MB", cast=int, default=1024)
+
+# HNSW index parameters for collection vector tables
+HNSW_M = env("HNSW_M", cast=int, default=24)
+HNSW_EF_CONSTRUCTION = env("HNSW_EF_CONSTRUCTION", cast=int, default=128)
 
 
 # Database configuration
@@ -65,11 +127,25 @@ POSTGRES_PORT = env("POSTGRES_PORT", cast=int, default="5432")
 POSTGRES_USER = env("POSTGRES_USER", cast=str, default="langchain")
 POSTGRES_PASSWORD = env("POSTGRES_PASSWORD", cast=str, default="langchain")
 POSTGRES_DB = env("POSTGRES_DB", cast=str, default="langchain_test")
-print(f"#### POSTGRES_HOST: {POSTGRES_HOST} ####")
-print(f"#### POSTGRES_PORT: {POSTGRES_PORT} ####")
-print(f"#### POSTGRES_USER: {POSTGRES_USER} ####")
-print(f"#### POSTGRES_PASSWORD: {POSTGRES_PASSWORD} ####")
-print(f"#### POSTGRES_DB: {POSTGRES_DB} ####")
+POSTGRES_POOL_MIN = env("POSTGRES_POOL_MIN", cast=int, default=10)
+POSTGRES_POOL_MAX = env("POSTGRES_POOL_MAX", cast=int, default=50)
+# Connection pool of the SQLAlchemy engine behind PGVectorStore. Hot paths use
+# the asyncpg pool above, so this one stays small; each worker can open up to
+# POSTGRES_POOL_MAX + VECTORSTORE_POOL_MAX server connections in total.
+VECTORSTORE_POOL_MIN = env("VECTORSTORE_POOL_MIN", cast=int, default=2)
+VECTORSTORE_POOL_MAX = env("VECTORSTORE_POOL_MAX", cast=int, default=10)
+# Seconds before a single statement is cancelled; 0 disables the limit
+POSTGRES_COMMAND_TIMEOUT = env("POSTGRES_COMMAND_TIMEOUT", cast=float, default=30)
+# Set to 1 when PostgreSQL is reached through pgbouncer in transaction mode.
+# Server-side prepared statements do not survive across pgbouncer backends, so
+# the asyncpg statement cache is disabled in that case.
+PG_USE_PGBOUNCER = env("PG_USE_PGBOUNCER", cast=str, default="") == "1"
+# Prepared statements kept per connection; raise it when many collections are
+# searched concurrently so their statements aren't evicted and re-prepared
+PG_STATEMENT_CACHE_SIZE = env("PG_STATEMENT_CACHE_SIZE", cast=int, default=1024)
+logger.info(
+    "PostgreSQL: %s@%s:%s/%s", POSTGRES_USER, POSTGRES_HOST, POSTGRES_PORT, POSTGRES_DB
+)
 
 # Default Admin User Configuration
 DEFAULT_ADMIN_USERNAME = env("DEFAULT_ADMIN_USERNAME", cast=str, default="admin")
@@ -88,8 +164,10 @@ MINIO_BUCKET_NAME = env("MINIO_BUCKET_NAME", cast=str, default="ragbackend-docum
 ALLOW_ORIGINS_JSON = env("ALLOW_ORIGINS", cast=str, default="")
 
 if ALLOW_ORIGINS_JSON:
-    ALLOWED_ORIGINS = json.loads(ALLOW_ORIGINS_JSON.strip())
-    print(f"ALLOW_ORIGINS environment variable set to: {ALLOW_ORIGINS_JSON}")
+    ALLOWED_ORIGINS = orjson.loads(ALLOW_ORIGINS_JSON.strip())
+    logger.info("ALLOW_ORIGINS environment variable set to: %s", ALLOW_ORIGINS_JSON)
 else:
-    ALLOWED_ORIGINS = "http://localhost:3000"
-    print("ALLOW_ORIGINS environment variable not set.")
+    # A list, not a bare string: CORSMiddleware tests membership with ``in``,
+    # which on a string would accept any origin that is a substring of it.
+    ALLOWED_ORIGINS = ["http://localhost:3000"]
+    logger.info("ALLOW_ORIGINS environment variable not set.")
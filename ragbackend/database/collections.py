@@ -8,21 +8,321 @@ The current implementations are based on langchain-postgres PGVectorStore class.
 Replace with your own implementation or favorite vectorstore if needed.
 """
 
+import asyncio
 import builtins
-import json
 import logging
+import re
+import time
 import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Mapping
+from datetime import datetime
 from typing import Any, NotRequired, Optional, TypedDict
 
+import asyncpg
+import orjson
+from asyncpg.utils import _quote_ident
 from fastapi import status
 from fastapi.exceptions import HTTPException
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_postgres import PGVectorStore
+from langchain_postgres.v2.indexes import HNSWIndex, HNSWQueryOptions
 
-from ragbackend.database.connection import get_db_connection, get_vectorstore_engine, get_vectorstore
+from ragbackend import config
+from ragbackend.database.connection import (
+    DEFAULT_VECTOR_SIZE,
+    evict_vectorstore,
+    get_db_connection,
+    get_db_pool,
+    get_vectorstore,
+)
+from ragbackend.services import semantic_cache
 
 logger = logging.getLogger(__name__)
 
 
+# Hot statements are kept as module constants so every call site sends the same
+# SQL text and hits asyncpg's per-connection prepared statement cache.
+_COLLECTION_COLUMNS = (
+    "uuid, name, table_id, metadata, embedding_model, embedding_dimensions"
+)
+_SELECT_COLLECTION_SQL = (
+    f"SELECT {_COLLECTION_COLUMNS} FROM collections WHERE uuid = $1"
+)
+# A NULL limit returns every row. uuid breaks ties between equal names so
+# pages don't overlap.
+_LIST_COLLECTIONS_SQL = f"""
+    SELECT {_COLLECTION_COLUMNS} FROM collections
+    ORDER BY name, uuid LIMIT $1 OFFSET $2
+"""
+# Listing without the metadata documents, which are often the bulk of a row
+_LIST_COLLECTION_SUMMARIES_SQL = """
+    SELECT uuid, name, table_id, NULL::jsonb AS metadata, embedding_model,
+        embedding_dimensions
+    FROM collections
+    ORDER BY name, uuid LIMIT $1 OFFSET $2
+"""
+# NULL parameters leave the column as it is
+_UPDATE_COLLECTION_SQL = f"""
+    UPDATE collections
+    SET name = COALESCE($2, name), metadata = COALESCE($3, metadata)
+    WHERE uuid = $1
+    RETURNING {_COLLECTION_COLUMNS}
+"""
+
+# Chunk tables are per collection, so their names can't be bind parameters and
+# are interpolated into the SQL text; they are always passed through
+# _quote_ident. Names are generated from the collection uuid and checked
+# against this pattern before a table is created.
+_TABLE_ID_RE = re.compile(r"[a-z0-9_]+")
+
+
+# pgvector's HNSW indexes cover up to this many halfvec dimensions
+_HALFVEC_MAX_INDEX_DIMENSIONS = 4000
+
+
+async def _supports_halfvec(conn: asyncpg.Connection) -> bool:
+    """Return True if the installed pgvector extension provides halfvec (>= 0.7)."""
+    version = await conn.fetchval(
+        "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+    )
+    if not version:
+        return False
+    major, minor = (int(part) for part in version.split(".")[:2])
+    return (major, minor) >= (0, 7)
+
+
+async def _create_vector_index(
+    conn: asyncpg.Connection, table_id: str, vector_size: int
+) -> bool:
+    """Store embeddings as halfvec when possible and build the HNSW index.
+
+    Cosine search is memory-bandwidth bound; halfvec halves the bytes read per
+    comparison and the size of the HNSW graph, with negligible recall loss on
+    normalized embeddings.
+
+    Returns:
+        False if pgvector is too old for halfvec or the vectors are too wide
+        for a halfvec HNSW index; the caller then builds the index on
+        full-precision vectors through the vector store.
+    """
+    if vector_size > _HALFVEC_MAX_INDEX_DIMENSIONS:
+        return False
+    if not await _supports_halfvec(conn):
+        return False
+    await conn.execute(
+        f'ALTER TABLE {_quote_ident(table_id)} ALTER COLUMN embedding '
+        f"TYPE halfvec({vector_size}) USING embedding::halfvec({vector_size})"
+    )
+    await conn.execute(
+        f'CREATE INDEX IF NOT EXISTS {_quote_ident(f"{table_id}_langchainvectorindex")} '
+        f'ON {_quote_ident(table_id)} USING hnsw (embedding halfvec_cosine_ops) '
+        f"WITH (m = {config.HNSW_M}, "
+        f"ef_construction = {config.HNSW_EF_CONSTRUCTION})"
+    )
+    return True
+
+
+async def _create_metadata_indexes(conn: asyncpg.Connection, table_id: str) -> None:
+    """Index the metadata keys that documents are looked up by.
+
+    Chunks are filtered and deleted by their source ``file_id``; an expression
+    index lets those lookups probe the index instead of extracting the key from
+    every row's metadata.
+    """
+    await conn.execute(
+        f'CREATE INDEX IF NOT EXISTS {_quote_ident(f"{table_id}_file_id_idx")} '
+        f'ON {_quote_ident(table_id)} '
+        "((langchain_metadata->>'file_id'))"
+    )
+
+
+async def _embed_documents(
+    embeddings: Embeddings, texts: list[str], batch_size: int
+) -> list[list[float]]:
+    """Embed texts in batches of ``batch_size`` sent concurrently.
+
+    OpenAIEmbeddings awaits its internal batches one after another, so a large
+    upload would otherwise pay one embedding round-trip per batch in series.
+    At most EMBED_MAX_CONCURRENT_BATCHES requests are in flight; vectors come
+    back in the order of ``texts``.
+    """
+    if len(texts) <= batch_size:
+        return await embeddings.aembed_documents(texts)
+
+    semaphore = asyncio.Semaphore(config.EMBED_MAX_CONCURRENT_BATCHES)
+
+    async def embed_batch(batch: list[str]) -> list[list[float]]:
+        async with semaphore:
+            return await embeddings.aembed_documents(batch)
+
+    batches = await asyncio.gather(
+        *(
+            embed_batch(texts[start : start + batch_size])
+            for start in range(0, len(texts), batch_size)
+        )
+    )
+    return [vector for batch in batches for vector in batch]
+
+
+class _QueryBatch:
+    """Search queries waiting to be embedded together."""
+
+    __slots__ = ("queries", "futures", "task")
+
+    def __init__(self):
+        self.queries: list[str] = []
+        self.futures: list[asyncio.Future] = []
+        self.task: Optional[asyncio.Task] = None
+
+
+# Open query batch per embeddings instance
+_query_batches: dict[int, _QueryBatch] = {}
+
+
+async def _embed_query_into(
+    embeddings: Embeddings, query: str, future: asyncio.Future
+) -> None:
+    try:
+        vector = await embeddings.aembed_query(query)
+    except Exception as e:
+        if not future.done():
+            future.set_exception(e)
+        return
+    if not future.done():
+        future.set_result(vector)
+
+
+async def _flush_query_batch(embeddings: Embeddings, batch: _QueryBatch) -> None:
+    """Embed a batch of queries and resolve their futures.
+
+    If the batched request fails, e.g. because one query is over the token
+    limit, each query is retried on its own so only the bad one fails.
+    """
+    try:
+        vectors = await embeddings.aembed_documents(batch.queries)
+        if len(vectors) != len(batch.queries):
+            raise ValueError(
+                f"Expected {len(batch.queries)} embeddings, got {len(vectors)}"
+            )
+    except Exception as e:
+        if len(batch.queries) == 1:
+            if not batch.futures[0].done():
+                batch.futures[0].set_exception(e)
+            return
+        logger.warning("Batched query embedding failed, retrying one by one: %s", e)
+        await asyncio.gather(
+            *(
+                _embed_query_into(embeddings, query, future)
+                for query, future in zip(batch.queries, batch.futures, strict=True)
+            )
+        )
+        return
+    for future, vector in zip(batch.futures, vectors, strict=True):
+        if not future.done():
+            future.set_result(vector)
+
+
+async def _flush_query_batch_after(
+    embeddings: Embeddings, key: int, batch: _QueryBatch, delay: float
+) -> None:
+    await asyncio.sleep(delay)
+    if _query_batches.get(key) is batch:
+        del _query_batches[key]
+    await _flush_query_batch(embeddings, batch)
+
+
+async def _embed_query_batched(embeddings: Embeddings, query: str) -> list[float]:
+    """Embed a search query together with others arriving at the same time.
+
+    Queries are collected for SEARCH_BATCH_WINDOW_MS and then embedded with a
+    single request, so concurrent searches share one provider round-trip
+    instead of each paying for its own. A batch is sent early once it holds
+    EMBED_BATCH_SIZE queries. A window of 0 embeds each query on its own.
+    """
+    window = config.SEARCH_BATCH_WINDOW_MS
+    if window <= 0:
+        return await embeddings.aembed_query(query)
+
+    key = id(embeddings)
+    batch = _query_batches.get(key)
+    if batch is None:
+        batch = _query_batches[key] = _QueryBatch()
+        batch.task = asyncio.ensure_future(
+            _flush_query_batch_after(embeddings, key, batch, window / 1000)
+        )
+    future = asyncio.get_running_loop().create_future()
+    batch.queries.append(query)
+    batch.futures.append(future)
+    if len(batch.queries) >= config.EMBED_BATCH_SIZE:
+        # Full: send it now instead of waiting out the window. The timer is
+        # still sleeping, since it takes the batch out of _query_batches as
+        # soon as it wakes.
+        del _query_batches[key]
+        batch.task.cancel()
+        batch.task = asyncio.ensure_future(_flush_query_batch(embeddings, batch))
+    return await future
+
+
+# Rows per FETCH when streaming chunks. Each FETCH is a round-trip, and
+# asyncpg's default of 50 makes a full export mostly wait on the network.
+_CURSOR_PREFETCH = 1000
+
+# Batches of at least this many chunks are written with binary COPY; below it,
+# creating the staging table costs more than the pipelined inserts it replaces.
+_COPY_THRESHOLD = 256
+
+
+async def _copy_upsert(
+    conn: asyncpg.Connection, table_id: str, records: list[tuple]
+) -> None:
+    """Upsert chunk rows into a collection table through binary COPY.
+
+    COPY can't resolve conflicts, so rows are streamed into a staging table
+    that is dropped at commit and merged with a single ``INSERT ... SELECT``.
+    Must run inside a transaction.
+    """
+    await conn.execute(
+        f'''
+        CREATE TEMP TABLE chunk_staging ON COMMIT DROP AS
+        SELECT langchain_id, content, embedding, langchain_metadata
+        FROM {_quote_ident(table_id)} WITH NO DATA
+        '''
+    )
+    await conn.copy_records_to_table("chunk_staging", records=records)
+    await conn.execute(
+        f'''
+        INSERT INTO {_quote_ident(table_id)}
+            (langchain_id, content, embedding, langchain_metadata)
+        SELECT langchain_id, content, embedding, langchain_metadata
+        FROM chunk_staging
+        ON CONFLICT (langchain_id) DO UPDATE SET
+            content = EXCLUDED.content,
+            embedding = EXCLUDED.embedding,
+            langchain_metadata = EXCLUDED.langchain_metadata
+        '''
+    )
+
+
+# Largest hnsw.ef_search pgvector accepts; SET fails for anything above it
+HNSW_EF_SEARCH_MAX = 1000
+
+
+def _hnsw_ef_search(k: int) -> int:
+    """Size hnsw.ef_search to the number of requested results.
+
+    pgvector's default of 40 loses recall for larger k; scale it with k while
+    never going below the default or above what pgvector accepts.
+    """
+    return min(max(40, k * 20), HNSW_EF_SEARCH_MAX)
+
+
+def _hnsw_query_options(k: int) -> HNSWQueryOptions:
+    """Return PGVectorStore query options for a search of k results."""
+    return HNSWQueryOptions(ef_search=_hnsw_ef_search(k))
+
+
 class CollectionDetails(TypedDict):
     """TypedDict for collection details."""
 
@@ -34,6 +334,25 @@ class CollectionDetails(TypedDict):
     embedding_dimensions: NotRequired[int]
 
 
+class CollectionRecord(asyncpg.Record):
+    """Record class for rows of the ``collections`` table."""
+
+    __slots__ = ()
+
+    def to_details(self) -> CollectionDetails:
+        """Convert the record into CollectionDetails."""
+        details: CollectionDetails = {
+            "uuid": self["uuid"],
+            "name": self["name"],
+            "table_id": self["table_id"],
+            "metadata": self["metadata"] or {},
+            "embedding_model": self["embedding_model"],
+        }
+        if self["embedding_dimensions"]:
+            details["embedding_dimensions"] = self["embedding_dimensions"]
+        return details
+
+
 class DocumentUpdate(TypedDict):
     """TypedDict for document updates."""
 
@@ -41,6 +360,179 @@ class DocumentUpdate(TypedDict):
     metadata: NotRequired[dict[str, Any]]
 
 
+class SearchHit(TypedDict):
+    """TypedDict for a result of ``Collection.search``."""
+
+    id: Optional[str]
+    content: str
+    metadata: dict[str, Any]
+    score: float
+
+
+class DocumentChunk(TypedDict):
+    """TypedDict for a chunk streamed by ``Collection.iter_document_dicts``."""
+
+    id: str
+    content: str
+    metadata: dict[str, Any]
+
+
+class FileDocumentMetadata(TypedDict):
+    """TypedDict for the original-file metadata of a listed document."""
+
+    filename: str
+    content_type: Optional[str]
+    file_size: int
+    upload_time: Optional[datetime]
+    object_path: str
+
+
+class FileDocument(TypedDict):
+    """TypedDict for a document as returned by ``Collection.list``."""
+
+    id: str
+    collection_id: str
+    content: str
+    metadata: FileDocumentMetadata
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+
+# Collection details by uuid, least recently used first. Every document
+# operation needs the collection's table_id, so caching the row saves a
+# round-trip per request. Entries live for COLLECTION_CACHE_TTL seconds and are
+# evicted here when this process updates or deletes the collection; other
+# workers see such changes once their entry expires.
+_DETAILS_CACHE_SIZE = 1024
+_details_cache: OrderedDict[str, tuple[float, CollectionDetails]] = OrderedDict()
+
+# Detail lookups in flight, so concurrent misses for one collection share a query
+_details_lookups: dict[str, asyncio.Task] = {}
+
+
+def _cache_details(collection_uuid: str, details: CollectionDetails) -> None:
+    ttl = config.COLLECTION_CACHE_TTL
+    if ttl <= 0:
+        return
+    _details_cache[collection_uuid] = (time.monotonic() + ttl, details)
+    _details_cache.move_to_end(collection_uuid)
+    if len(_details_cache) > _DETAILS_CACHE_SIZE:
+        _details_cache.popitem(last=False)
+
+
+def evict_collection_details(collection_uuid: str) -> None:
+    """Forget the cached details of a collection."""
+    _details_cache.pop(collection_uuid, None)
+
+
+def clear_collection_details_cache() -> None:
+    """Forget all cached collection details."""
+    _details_cache.clear()
+
+
+# Semantic caches of unfiltered search results by chunk table, least recently
+# used first. Writes through this process clear the collection's cache; other
+# workers serve results up to SEMANTIC_CACHE_TTL seconds old.
+_SEARCH_CACHES_SIZE = 64
+_search_caches: OrderedDict[str, semantic_cache.SemanticCache] = OrderedDict()
+
+
+def _get_search_cache(table_id: str) -> Optional[semantic_cache.SemanticCache]:
+    if not semantic_cache.is_enabled():
+        return None
+    cache = _search_caches.get(table_id)
+    if cache is None:
+        cache = _search_caches[table_id] = semantic_cache.new_cache()
+        if len(_search_caches) > _SEARCH_CACHES_SIZE:
+            _search_caches.popitem(last=False)
+    else:
+        _search_caches.move_to_end(table_id)
+    return cache
+
+
+def _freeze_search_rows(rows: list[asyncpg.Record]) -> list[tuple]:
+    """Snapshot search rows for the semantic cache.
+
+    Metadata is kept as JSON bytes so a caller mutating the metadata of its
+    hits can't change what later cache hits return.
+    """
+    return [
+        (
+            row["langchain_id"],
+            row["content"],
+            orjson.dumps(row["langchain_metadata"]),
+            row["distance"],
+        )
+        for row in rows
+    ]
+
+
+def _thaw_search_rows(rows: list[tuple]) -> list[dict[str, Any]]:
+    """Rebuild search rows with fresh metadata dicts from a cached snapshot."""
+    return [
+        {
+            "langchain_id": langchain_id,
+            "content": content,
+            "langchain_metadata": orjson.loads(metadata),
+            "distance": distance,
+        }
+        for langchain_id, content, metadata, distance in rows
+    ]
+
+
+def evict_search_cache(table_id: str) -> None:
+    """Forget the cached search results of a collection's chunk table."""
+    _search_caches.pop(table_id, None)
+
+
+def clear_search_caches() -> None:
+    """Forget all cached search results."""
+    _search_caches.clear()
+
+
+async def _fetch_details(collection_uuid: str) -> Optional[CollectionDetails]:
+    async with get_db_connection() as conn:
+        row = await conn.fetchrow(
+            _SELECT_COLLECTION_SQL,
+            collection_uuid,
+            record_class=CollectionRecord,
+        )
+    return row.to_details() if row else None
+
+
+async def _get_details(collection_uuid: str) -> CollectionDetails:
+    """Return a collection's details, from the cache when possible.
+
+    Raises:
+        HTTPException: 404 if the collection doesn't exist.
+    """
+    cached = _details_cache.get(collection_uuid)
+    if cached is not None:
+        expires_at, details = cached
+        if expires_at > time.monotonic():
+            _details_cache.move_to_end(collection_uuid)
+            return details
+        del _details_cache[collection_uuid]
+
+    task = _details_lookups.get(collection_uuid)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_details(collection_uuid))
+        _details_lookups[collection_uuid] = task
+        task.add_done_callback(
+            lambda _: _details_lookups.pop(collection_uuid, None)
+        )
+    # Shield the shared lookup so one cancelled request doesn't fail the others
+    details = await asyncio.shield(task)
+
+    if details is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Collection {collection_uuid} not found",
+        )
+    _cache_details(collection_uuid, details)
+    return details
+
+
 class Collection:
     """Manages a vector-based collection of documents."""
 
@@ -63,10 +555,100 @@ class Collection:
         return self._details
     
     async def _load_details(self):
-        """Load collection details from database."""
-        manager = CollectionsManager()
-        collection = await manager.get_collection(self.collection_id)
-        self._details = collection._details
+        """Load collection details from the cache or the database."""
+        self._details = await _get_details(self.collection_id)
+
+    async def _get_store(self, embeddings: Embeddings, k: int) -> PGVectorStore:
+        """Return the collection's vectorstore, configured for k results."""
+        if not self._details:
+            await self._load_details()
+        return await get_vectorstore(
+            collection_name=self._details["table_id"],
+            embeddings=embeddings,
+            index_query_options=_hnsw_query_options(k),
+        )
+
+    async def _embed_query_and_get_store(
+        self, query: str, k: int
+    ) -> tuple[list[float], PGVectorStore]:
+        """Embed the query while the collection's vectorstore is being loaded.
+
+        The embedding request is the slowest part of a search, so it runs
+        concurrently with the details lookup and store initialization.
+        """
+        embeddings = config.get_default_embeddings()
+        return await asyncio.gather(
+            _embed_query_batched(embeddings, query),
+            self._get_store(embeddings, k),
+        )
+
+    async def _embed_query(self, query: str) -> list[float]:
+        """Embed the query while the collection details are being loaded."""
+        embeddings = config.get_default_embeddings()
+        if self._details:
+            return await _embed_query_batched(embeddings, query)
+        embedding, _ = await asyncio.gather(
+            _embed_query_batched(embeddings, query), self._load_details()
+        )
+        return embedding
+
+    async def _search_rows(
+        self, embedding: list[float], k: int
+    ) -> list[Mapping[str, Any]]:
+        """Run an unfiltered cosine nearest-neighbour query on asyncpg.
+
+        The statement text only depends on the table, so asyncpg prepares it
+        once per connection and later searches skip parsing and planning. The
+        HNSW index scan is the right plan for any query vector, so the generic
+        plan is forced instead of re-planning for each new vector.
+
+        Results are served from the collection's semantic cache when a
+        near-identical query was searched recently.
+        """
+        table_id = self._details["table_id"]
+        cache = _get_search_cache(table_id)
+        if cache is not None:
+            rows = cache.get(embedding, k)
+            if rows is not None:
+                return _thaw_search_rows(rows)
+
+        async with get_db_connection() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    f"SET LOCAL hnsw.ef_search = {_hnsw_ef_search(k)}; "
+                    "SET LOCAL plan_cache_mode = force_generic_plan"
+                )
+                rows = await conn.fetch(
+                    f'''
+                    SELECT langchain_id, content, langchain_metadata,
+                        embedding <=> $1 AS distance
+                    FROM {_quote_ident(table_id)}
+                    ORDER BY embedding <=> $1
+                    LIMIT $2
+                    ''',
+                    embedding,
+                    k,
+                )
+
+        if cache is not None:
+            cache.put(embedding, k, _freeze_search_rows(rows))
+        return rows
+
+    async def _search_by_vector(
+        self, embedding: list[float], k: int
+    ) -> list[tuple[Document, float]]:
+        """Run ``_search_rows`` and wrap the rows as scored Documents."""
+        return [
+            (
+                Document(
+                    id=row["langchain_id"],
+                    page_content=row["content"],
+                    metadata=row["langchain_metadata"] or {},
+                ),
+                float(row["distance"]),
+            )
+            for row in await self._search_rows(embedding, k)
+        ]
 
     async def similarity_search(
         self,
@@ -76,14 +658,14 @@ class Collection:
         filter: Optional[dict[str, Any]] = None,
     ) -> list[Document]:
         """Perform similarity search."""
-        from ragbackend import config
+        if not filter:
+            embedding = await self._embed_query(query)
+            return [doc for doc, _ in await self._search_by_vector(embedding, k)]
 
-        if not self._details:
-            await self._load_details()
-        
-        embeddings = config.get_default_embeddings()
-        store = await get_vectorstore(collection_name=self._details["table_id"])
-        return await store.asimilarity_search(query, k=k, filter=filter)
+        embedding, store = await self._embed_query_and_get_store(query, k)
+        return await store.asimilarity_search_by_vector(
+            embedding, k=k, filter=filter
+        )
 
     async def similarity_search_with_score(
         self,
@@ -93,149 +675,352 @@ class Collection:
         filter: Optional[dict[str, Any]] = None,
     ) -> list[tuple[Document, float]]:
         """Perform similarity search with scores."""
-        from ragbackend import config
+        if not filter:
+            embedding = await self._embed_query(query)
+            return await self._search_by_vector(embedding, k)
+
+        embedding, store = await self._embed_query_and_get_store(query, k)
+        return await store.asimilarity_search_with_score_by_vector(
+            embedding, k=k, filter=filter
+        )
+
+    async def similarity_search_many(
+        self,
+        queries: builtins.list[str],
+        *,
+        k: int = 4,
+        filter: Optional[dict[str, Any]] = None,
+    ) -> builtins.list[builtins.list[Document]]:
+        """Perform a similarity search for each of several queries.
+
+        All queries are embedded with one provider request and the
+        nearest-neighbour probes then run concurrently. Results are in the
+        order of ``queries``.
+        """
+        if not queries:
+            return []
+
+        embeddings = config.get_default_embeddings()
+        if filter:
+            vectors, store = await asyncio.gather(
+                _embed_documents(embeddings, queries, config.EMBED_BATCH_SIZE),
+                self._get_store(embeddings, k),
+            )
+            return await asyncio.gather(
+                *(
+                    store.asimilarity_search_by_vector(vector, k=k, filter=filter)
+                    for vector in vectors
+                )
+            )
+
+        if self._details:
+            vectors = await _embed_documents(
+                embeddings, queries, config.EMBED_BATCH_SIZE
+            )
+        else:
+            vectors, _ = await asyncio.gather(
+                _embed_documents(embeddings, queries, config.EMBED_BATCH_SIZE),
+                self._load_details(),
+            )
+        results = await asyncio.gather(
+            *(self._search_by_vector(vector, k) for vector in vectors)
+        )
+        return [[doc for doc, _ in hits] for hits in results]
 
+    async def add_documents(
+        self, docs: list[Document], batch_size: Optional[int] = None
+    ) -> list[str]:
+        """Add documents to collection.
+
+        Chunks are embedded in concurrent batches of ``batch_size`` (default
+        EMBED_BATCH_SIZE) and written in one transaction, instead of
+        PGVectorStore's connection and commit per row: large batches through
+        binary COPY, small ones with a pipelined ``executemany``.
+        """
         if not self._details:
             await self._load_details()
+        if not docs:
+            return []
 
-        embeddings = config.get_default_embeddings()
-        store = await get_vectorstore(collection_name=self._details["table_id"])
-        return await store.asimilarity_search_with_score(query, k=k, filter=filter)
+        vectors = await _embed_documents(
+            config.get_default_embeddings(),
+            [doc.page_content for doc in docs],
+            batch_size or config.EMBED_BATCH_SIZE,
+        )
+        ids = [doc.id or str(uuid.uuid4()) for doc in docs]
+        records = [
+            (
+                doc_id,
+                doc.page_content,
+                vector,
+                doc.metadata,
+            )
+            for doc_id, doc, vector in zip(ids, docs, vectors, strict=True)
+        ]
+
+        table_id = self._details["table_id"]
+        async with get_db_connection() as conn:
+            async with conn.transaction():
+                if len(records) >= _COPY_THRESHOLD:
+                    await _copy_upsert(conn, table_id, records)
+                else:
+                    await conn.executemany(
+                        f'''
+                        INSERT INTO {_quote_ident(table_id)}
+                            (langchain_id, content, embedding, langchain_metadata)
+                        VALUES ($1, $2, $3, $4)
+                        ON CONFLICT (langchain_id) DO UPDATE SET
+                            content = EXCLUDED.content,
+                            embedding = EXCLUDED.embedding,
+                            langchain_metadata = EXCLUDED.langchain_metadata
+                        ''',
+                        records,
+                    )
+        evict_search_cache(table_id)
+        return ids
 
-    async def add_documents(self, docs: list[Document]) -> list[str]:
-        """Add documents to collection."""
+    async def iter_document_dicts(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after_id: Optional[str] = None,
+    ) -> AsyncIterator[DocumentChunk]:
+        """Stream chunks from the collection through a server-side cursor.
+
+        Chunks are yielded as plain dicts, ready to be serialized; use
+        ``iter_documents`` for Document objects.
+
+        Rows are fetched in batches of _CURSOR_PREFETCH, so memory stays
+        bounded no matter how many documents are requested.
+
+        Documents are ordered by id. To page through a collection, pass the id
+        of the last document received as ``after_id``: the primary key index
+        seeks straight to it, while ``offset`` makes the server read and
+        discard every skipped row. Both can be combined.
+        """
         if not self._details:
             await self._load_details()
-        store = await get_vectorstore(collection_name=self._details["table_id"])
-        return await store.aadd_documents(docs)
+        table_id = self._details["table_id"]
+
+        if after_id is None:
+            query = f'''
+                SELECT langchain_id, content, langchain_metadata
+                FROM {_quote_ident(table_id)}
+                ORDER BY langchain_id
+                LIMIT $1 OFFSET $2
+            '''
+            args = (limit, offset)
+        else:
+            query = f'''
+                SELECT langchain_id, content, langchain_metadata
+                FROM {_quote_ident(table_id)}
+                WHERE langchain_id > $3::uuid
+                ORDER BY langchain_id
+                LIMIT $1 OFFSET $2
+            '''
+            args = (limit, offset, after_id)
+
+        async with get_db_connection() as conn:
+            async with conn.transaction():
+                async for doc_id, content, metadata in conn.cursor(
+                    query, *args, prefetch=_CURSOR_PREFETCH
+                ):
+                    metadata = metadata or {}
+                    metadata["custom_id"] = doc_id
+                    yield {"id": doc_id, "content": content, "metadata": metadata}
+
+    async def iter_documents(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after_id: Optional[str] = None,
+    ) -> AsyncIterator[Document]:
+        """Stream documents from the collection; see ``iter_document_dicts``."""
+        async for chunk in self.iter_document_dicts(
+            limit=limit, offset=offset, after_id=after_id
+        ):
+            yield Document(
+                id=chunk["id"],
+                page_content=chunk["content"],
+                metadata=chunk["metadata"],
+            )
 
     async def get_documents(
         self,
         ids: Optional[list[str]] = None,
         limit: Optional[int] = None,
         offset: int = 0,
+        after_id: Optional[str] = None,
     ) -> list[Document]:
-        """Get documents from collection."""
+        """Get documents from collection.
+
+        Without ``ids``, pages are ordered by id; see ``iter_documents`` for
+        ``after_id``.
+        """
         if not self._details:
             await self._load_details()
-        store = await get_vectorstore(collection_name=self._details["table_id"])
-        
-        # Use the collection method to get documents
+
         if ids:
             # Get specific documents by IDs
+            store = await get_vectorstore(collection_name=self._details["table_id"])
             return await store.aget_by_ids(ids)
-        else:
-            # Get all documents with pagination
-            # Note: This is a simplified approach, actual implementation may vary
-            # based on the specific PGVectorStore API
-            all_docs = []
-            try:
-                # Try to use a search with very broad criteria to get all documents
-                # This is a workaround since PGVectorStore might not have a direct "get all" method
-                async with get_db_connection() as conn:
-                    table_name = self._details["table_id"]
-                    
-                    # Build query with pagination
-                    query = f"""
-                        SELECT id, document, cmetadata, custom_id
-                        FROM vectorstore_{table_name}
-                        ORDER BY id
-                        OFFSET $1
-                    """
-                    
-                    if limit:
-                        query += " LIMIT $2"
-                        rows = await conn.fetch(query, offset, limit)
-                    else:
-                        rows = await conn.fetch(query, offset)
-                    
-                    for row in rows:
-                        doc_data = json.loads(row["document"]) if isinstance(row["document"], str) else row["document"]
-                        metadata = json.loads(row["cmetadata"]) if isinstance(row["cmetadata"], str) else row["cmetadata"] or {}
-                        metadata["custom_id"] = row["custom_id"]
-                        
-                        doc = Document(
-                            page_content=doc_data.get("page_content", ""),
-                            metadata=metadata
-                        )
-                        all_docs.append(doc)
-                        
-            except Exception as e:
-                logger.error(f"Error getting documents: {e}")
-                # Fallback to empty list
-                return []
-                
-            return all_docs
+
+        # Get all documents with pagination
+        try:
+            return [
+                doc
+                async for doc in self.iter_documents(
+                    limit=limit, offset=offset, after_id=after_id
+                )
+            ]
+        except Exception as e:
+            logger.error("Error getting documents: %s", e)
+            # Fallback to empty list
+            return []
 
     async def update_document(self, doc_id: str, update: DocumentUpdate) -> bool:
-        """Update a document in the collection."""
+        """Update a document in the collection.
+
+        The metadata patch is merged server-side with ``||``, so the stored
+        document is never fetched, parsed and re-serialized in Python. Only
+        the columns present in ``update`` are written; a content-only update
+        leaves the metadata column untouched.
+        """
         try:
             if not self._details:
                 await self._load_details()
-            async with get_db_connection() as conn:
-                table_name = self._details["table_id"]
-                
-                # First, get the existing document
-                existing_row = await conn.fetchrow(
-                    f"SELECT document, cmetadata FROM vectorstore_{table_name} WHERE custom_id = $1",
-                    doc_id
+
+            assignments = []
+            values = [doc_id]
+            if update.get("page_content") is not None:
+                values.append(update["page_content"])
+                assignments.append(f"content = ${len(values)}")
+            if update.get("metadata"):
+                values.append(update["metadata"])
+                assignments.append(
+                    "langchain_metadata = (COALESCE(langchain_metadata::jsonb, "
+                    f"'{{}}') || ${len(values)}::jsonb)::json"
                 )
-                
-                if not existing_row:
-                    return False
-                
-                # Parse existing data
-                existing_doc = json.loads(existing_row["document"]) if isinstance(existing_row["document"], str) else existing_row["document"]
-                existing_metadata = json.loads(existing_row["cmetadata"]) if isinstance(existing_row["cmetadata"], str) else existing_row["cmetadata"] or {}
-                
-                # Apply updates
-                if "page_content" in update:
-                    existing_doc["page_content"] = update["page_content"]
-                
-                if "metadata" in update:
-                    existing_metadata.update(update["metadata"])
-                
-                # Update in database
-                await conn.execute(
-                    f"""
-                    UPDATE vectorstore_{table_name}
-                    SET document = $1, cmetadata = $2
-                    WHERE custom_id = $3
-                    """,
-                    json.dumps(existing_doc),
-                    json.dumps(existing_metadata),
-                    doc_id
+
+            table_id = self._details["table_id"]
+            async with get_db_connection() as conn:
+                if not assignments:
+                    # Nothing to change; report whether the document exists
+                    return await conn.fetchval(
+                        f'SELECT EXISTS (SELECT 1 FROM {_quote_ident(table_id)} '
+                        "WHERE langchain_id = $1::uuid)",
+                        doc_id,
+                    )
+                result = await conn.execute(
+                    f'UPDATE {_quote_ident(table_id)} SET {", ".join(assignments)} '
+                    "WHERE langchain_id = $1::uuid",
+                    *values,
                 )
-                
-                return True
-                
+            evict_search_cache(table_id)
+            return result != "UPDATE 0"
+
         except Exception as e:
-            logger.error(f"Error updating document {doc_id}: {e}")
+            logger.error("Error updating document %s: %s", doc_id, e)
             return False
 
+    async def update_documents(
+        self, updates: builtins.list[tuple[str, DocumentUpdate]]
+    ) -> builtins.list[str]:
+        """Update several documents with one statement.
+
+        The updates are bound as parallel arrays and joined to the table with
+        ``unnest``, so any number of documents costs one round-trip. Fields
+        missing from an update keep their value; metadata is merged as in
+        ``update_document``.
+
+        Returns:
+            The ids of the documents that exist and were updated.
+        """
+        if not updates:
+            return []
+        try:
+            if not self._details:
+                await self._load_details()
+
+            ids, contents, metadata = [], [], []
+            for doc_id, update in updates:
+                ids.append(doc_id)
+                contents.append(update.get("page_content"))
+                metadata.append(update.get("metadata") or None)
+
+            table_id = self._details["table_id"]
+            async with get_db_connection() as conn:
+                rows = await conn.fetch(
+                    f'''
+                    UPDATE {_quote_ident(table_id)} AS t
+                    SET content = COALESCE(u.content, t.content),
+                        langchain_metadata = CASE
+                            WHEN u.metadata IS NULL THEN t.langchain_metadata
+                            ELSE (COALESCE(t.langchain_metadata::jsonb, '{{}}')
+                                  || u.metadata)::json
+                        END
+                    FROM unnest($1::uuid[], $2::text[], $3::jsonb[])
+                        AS u(id, content, metadata)
+                    WHERE t.langchain_id = u.id
+                    RETURNING t.langchain_id
+                    ''',
+                    ids,
+                    contents,
+                    metadata,
+                )
+            evict_search_cache(table_id)
+            return [row["langchain_id"] for row in rows]
+
+        except Exception as e:
+            logger.error("Error updating documents: %s", e)
+            return []
+
     async def delete_documents(self, ids: list[str]) -> bool:
         """Delete documents from collection."""
         try:
             if not self._details:
                 await self._load_details()
-            store = await get_vectorstore(collection_name=self._details["table_id"])
-            await store.adelete(ids)
+            # Bind the ids as one uuid[] so the statement text is the same for
+            # any number of ids and the primary key index stays usable.
+            async with get_db_connection() as conn:
+                await conn.execute(
+                    f'DELETE FROM {_quote_ident(self._details["table_id"])} '
+                    "WHERE langchain_id = ANY($1::uuid[])",
+                    ids,
+                )
+            evict_search_cache(self._details["table_id"])
             return True
         except Exception as e:
-            logger.error(f"Error deleting documents: {e}")
+            logger.error("Error deleting documents: %s", e)
             return False
 
-    async def count_documents(self) -> int:
-        """Count documents in collection."""
+    async def count_documents(self, exact: bool = False) -> int:
+        """Count documents in collection.
+
+        By default the planner's row estimate from ``pg_class`` is returned,
+        which costs a catalog lookup instead of a scan of the whole table; it
+        is refreshed by (auto)vacuum and analyze, so it can lag recent writes.
+        Tables that haven't been analyzed yet, and ``exact=True``, fall back
+        to ``COUNT(*)``.
+        """
         try:
             if not self._details:
                 await self._load_details()
+            table_id = self._details["table_id"]
             async with get_db_connection() as conn:
-                table_name = self._details["table_id"]
-                result = await conn.fetchval(f"SELECT COUNT(*) FROM vectorstore_{table_name}")
+                if not exact:
+                    estimate = await conn.fetchval(
+                        "SELECT reltuples::bigint FROM pg_class WHERE oid = $1::regclass",
+                        _quote_ident(table_id),
+                    )
+                    if estimate is not None and estimate >= 0:
+                        return estimate
+                result = await conn.fetchval(
+                    f"SELECT COUNT(*) FROM {_quote_ident(table_id)}"
+                )
                 return result or 0
         except Exception as e:
-            logger.error(f"Error counting documents: {e}")
+            logger.error("Error counting documents: %s", e)
             return 0
     
     async def upsert(self, docs: list[Document]) -> list[str]:
@@ -245,85 +1030,87 @@ class Collection:
     async def delete(self, file_id: str) -> bool:
         """Delete documents by file_id and clean up MinIO files."""
         try:
-            # First, get all documents with this file_id to find their IDs
             if not self._details:
                 await self._load_details()
-                
+
+            # Delete every chunk of the file and, if there were any, its
+            # file_storage row in a single statement; the file_id expression
+            # index turns the chunk lookup into an index probe.
             async with get_db_connection() as conn:
-                table_name = self._details["table_id"]
-                
-                # Find all document IDs with this file_id
-                doc_rows = await conn.fetch(
-                    f"""
-                    SELECT custom_id FROM vectorstore_{table_name}
-                    WHERE cmetadata->>'file_id' = $1
-                    """,
-                    file_id
+                row = await conn.fetchrow(
+                    f'''
+                    WITH chunks AS (
+                        DELETE FROM {_quote_ident(self._details["table_id"])}
+                        WHERE langchain_metadata->>'file_id' = $1
+                        RETURNING 1
+                    ), file AS (
+                        DELETE FROM file_storage
+                        WHERE file_id = $1 AND EXISTS (SELECT 1 FROM chunks)
+                        RETURNING object_path
+                    )
+                    SELECT EXISTS (SELECT 1 FROM chunks) AS deleted,
+                        (SELECT object_path FROM file) AS object_path
+                    ''',
+                    file_id,
                 )
-                
-                if not doc_rows:
-                    logger.warning(f"No documents found with file_id: {file_id}")
-                    return False
-                
-                doc_ids = [row['custom_id'] for row in doc_rows]
-                
-                # Delete from vector store
-                success = await self.delete_documents(doc_ids)
-                
-                if success:
-                    # Delete from MinIO and file metadata
-                    from ragbackend.services.minio_service import get_minio_service
-                    from ragbackend.database.files import get_file_metadata, delete_file_metadata
-                    
-                    try:
-                        # Get file metadata to find MinIO object path
-                        file_metadata = await get_file_metadata(file_id)
-                        if file_metadata:
-                            # Delete from MinIO
-                            minio_service = get_minio_service()
-                            await minio_service.delete_file(file_metadata['object_path'])
-                            
-                            # Delete file metadata from database
-                            await delete_file_metadata(file_id)
-                            
-                            logger.info(f"Successfully deleted file {file_id} from collection {self.collection_id}")
-                        else:
-                            logger.warning(f"No file metadata found for file_id: {file_id}")
-                            
-                    except Exception as e:
-                        logger.error(f"Failed to clean up MinIO file {file_id}: {e}")
-                        # Document deletion was successful, so we still return True
-                
-                return success
-                
+
+            if not row["deleted"]:
+                logger.warning("No documents found with file_id: %s", file_id)
+                return False
+            evict_search_cache(self._details["table_id"])
+
+            if row["object_path"] is None:
+                logger.warning("No file metadata found for file_id: %s", file_id)
+                return True
+
+            # Delete from MinIO
+            from ragbackend.services.minio_service import get_minio_service
+
+            try:
+                await get_minio_service().delete_file(row["object_path"])
+                logger.info("Successfully deleted file %s from collection %s", file_id, self.collection_id)
+            except Exception as e:
+                logger.error("Failed to clean up MinIO file %s: %s", file_id, e)
+                # Document deletion was successful, so we still return True
+
+            return True
+
         except Exception as e:
-            logger.error(f"Error deleting documents with file_id {file_id}: {e}")
+            logger.error("Error deleting documents with file_id %s: %s", file_id, e)
             return False
     
-    async def search(self, query: str, limit: int = 10) -> list:
-        """Search for documents in the collection."""
+    async def search(
+        self, query: str, limit: int = 10
+    ) -> builtins.list[SearchHit]:
+        """Search for documents in the collection.
+
+        Hits are built straight from the result rows, without going through
+        Document objects.
+        """
         try:
-            # Perform similarity search
-            search_results = await self.similarity_search_with_score(query, k=limit)
-            
-            # Format results for API response
-            formatted_results = []
-            for doc, score in search_results:
-                result = {
-                    "content": doc.page_content,
-                    "metadata": doc.metadata,
-                    "score": float(score)
-                }
-                formatted_results.append(result)
-            
-            return formatted_results
+            embedding = await self._embed_query(query)
+            return [
+                SearchHit(
+                    id=row["langchain_id"],
+                    content=row["content"],
+                    metadata=row["langchain_metadata"] or {},
+                    score=float(row["distance"]),
+                )
+                for row in await self._search_rows(embedding, limit)
+            ]
             
         except Exception as e:
-            logger.error(f"Error searching collection {self.collection_id}: {e}")
+            logger.error("Error searching collection %s: %s", self.collection_id, e)
             return []
     
-    async def list(self, limit: int = 10, offset: int = 0) -> list:
-        """List documents in the collection with file information."""
+    async def list(
+        self, limit: int = 10, offset: int = 0
+    ) -> builtins.list[FileDocument]:
+        """List documents in the collection with file information.
+
+        Timestamps are left as ``datetime``; the API renders them with orjson,
+        which writes the same ISO 8601 text ``isoformat`` would.
+        """
         try:
             from ragbackend.database.files import get_files_by_collection
             
@@ -335,29 +1122,31 @@ class Collection:
                 offset=offset
             )
             
+            if not files:
+                return []
+
             # Format for API response
-            formatted_files = []
-            for file_record in files:
-                formatted_file = {
-                    "id": file_record['file_id'],
-                    "collection_id": self.collection_id,
-                    "content": f"File: {file_record['filename']} ({file_record['file_size']} bytes)",
+            collection_id = self.collection_id
+            return [
+                {
+                    "id": record["file_id"],
+                    "collection_id": collection_id,
+                    "content": f"File: {record['filename']} ({record['file_size']} bytes)",
                     "metadata": {
-                        "filename": file_record['filename'],
-                        "content_type": file_record['content_type'],
-                        "file_size": file_record['file_size'],
-                        "upload_time": file_record['upload_time'].isoformat() if file_record['upload_time'] else None,
-                        "object_path": file_record['object_path']
+                        "filename": record["filename"],
+                        "content_type": record["content_type"],
+                        "file_size": record["file_size"],
+                        "upload_time": record["upload_time"],
+                        "object_path": record["object_path"],
                     },
-                    "created_at": file_record['created_at'].isoformat() if file_record['created_at'] else None,
-                    "updated_at": file_record['updated_at'].isoformat() if file_record['updated_at'] else None
+                    "created_at": record["created_at"],
+                    "updated_at": record["updated_at"],
                 }
-                formatted_files.append(formatted_file)
-            
-            return formatted_files
+                for record in files
+            ]
             
         except Exception as e:
-            logger.error(f"Error listing documents in collection {self.collection_id}: {e}")
+            logger.error("Error listing documents in collection %s: %s", self.collection_id, e)
             return []
 
 
@@ -370,6 +1159,12 @@ class CollectionsManager:
 
     async def setup(self):
         """Create the collection metadata table if it doesn't exist."""
+        async with get_db_connection() as conn:
+            await conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        # Connections opened before the extension existed lack the pgvector
+        # codecs; have the pool reopen them.
+        await (await get_db_pool()).expire_connections()
+
         async with get_db_connection() as conn:
             await conn.execute("""
                 CREATE TABLE IF NOT EXISTS collections (
@@ -393,92 +1188,90 @@ class CollectionsManager:
         """Create a new collection."""
         collection_uuid = str(uuid.uuid4())
         table_id = f"collection_{collection_uuid.replace('-', '_')}"
+        if not _TABLE_ID_RE.fullmatch(table_id):
+            raise ValueError(f"Invalid collection table name: {table_id!r}")
+        # Build our own copy once so the returned details never alias the
+        # caller's dict.
+        metadata = {**metadata} if metadata else {}
 
         details: CollectionDetails = {
             "name": name,
             "uuid": collection_uuid,
             "table_id": table_id,
-            "metadata": metadata or {},
+            "metadata": metadata,
             "embedding_model": embedding_model,
         }
 
         if embedding_dimensions:
             details["embedding_dimensions"] = embedding_dimensions
 
-        # Create vectorstore table
-        store = await get_vectorstore(collection_name=table_id)
+        # Create vectorstore table with an HNSW index so searches use an
+        # index scan instead of a sequential scan + sort.
+        vector_size = embedding_dimensions or DEFAULT_VECTOR_SIZE
+        store = await get_vectorstore(
+            collection_name=table_id, vector_size=vector_size
+        )
 
-        # Insert collection metadata
+        # The column change, the indexes and the metadata row share one
+        # connection and one transaction, so a failure part way leaves no
+        # half-configured collection registered.
         async with get_db_connection() as conn:
-            await conn.execute(
-                """
-                INSERT INTO collections (uuid, name, table_id, metadata, embedding_model, embedding_dimensions)
-                VALUES ($1, $2, $3, $4, $5, $6)
-                """,
-                collection_uuid,
-                name,
-                table_id,
-                json.dumps(metadata or {}),
-                embedding_model,
-                embedding_dimensions,
+            async with conn.transaction():
+                uses_halfvec = await _create_vector_index(
+                    conn, table_id, vector_size
+                )
+                await _create_metadata_indexes(conn, table_id)
+                await conn.execute(
+                    """
+                    INSERT INTO collections (uuid, name, table_id, metadata, embedding_model, embedding_dimensions)
+                    VALUES ($1, $2, $3, $4, $5, $6)
+                    """,
+                    collection_uuid,
+                    name,
+                    table_id,
+                    metadata,
+                    embedding_model,
+                    embedding_dimensions,
+                )
+
+        if not uses_halfvec:
+            await store.aapply_vector_index(
+                HNSWIndex(m=config.HNSW_M, ef_construction=config.HNSW_EF_CONSTRUCTION)
             )
 
         return details
 
     async def get_collection(self, collection_uuid: str) -> Collection:
         """Get a collection by UUID."""
-        async with get_db_connection() as conn:
-            row = await conn.fetchrow(
-                "SELECT uuid, name, table_id, metadata, embedding_model, embedding_dimensions FROM collections WHERE uuid = $1",
-                collection_uuid,
-            )
-
-        if not row:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Collection {collection_uuid} not found",
-            )
-
-        details: CollectionDetails = {
-            "uuid": str(row["uuid"]),
-            "name": row["name"],
-            "table_id": row["table_id"],
-            "metadata": json.loads(row["metadata"]) if row["metadata"] else {},
-            "embedding_model": row["embedding_model"],
-        }
-
-        if row["embedding_dimensions"]:
-            details["embedding_dimensions"] = row["embedding_dimensions"]
-
         return Collection(
             collection_id=collection_uuid,
             user_id=self.user_id or "",
-            details=details
+            details=await _get_details(collection_uuid),
         )
 
-    async def list_collections(self) -> list[CollectionDetails]:
-        """List all collections."""
+    async def list_collections(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        summary: bool = False,
+    ) -> list[CollectionDetails]:
+        """List collections ordered by name.
+
+        Args:
+            limit: Maximum number of collections to return (all if None).
+            offset: Number of collections to skip.
+            summary: Leave out the metadata, which is returned as ``{}``; the
+                documents are then neither sent by the server nor decoded.
+        """
         async with get_db_connection() as conn:
             rows = await conn.fetch(
-                "SELECT uuid, name, table_id, metadata, embedding_model, embedding_dimensions FROM collections ORDER BY name"
+                _LIST_COLLECTION_SUMMARIES_SQL if summary else _LIST_COLLECTIONS_SQL,
+                limit,
+                offset,
+                record_class=CollectionRecord,
             )
 
-        collections = []
-        for row in rows:
-            details: CollectionDetails = {
-                "uuid": str(row["uuid"]),
-                "name": row["name"],
-                "table_id": row["table_id"],
-                "metadata": json.loads(row["metadata"]) if row["metadata"] else {},
-                "embedding_model": row["embedding_model"],
-            }
-
-            if row["embedding_dimensions"]:
-                details["embedding_dimensions"] = row["embedding_dimensions"]
-
-            collections.append(details)
-
-        return collections
+        return [row.to_details() for row in rows]
 
     async def update_collection(
         self,
@@ -486,96 +1279,80 @@ class CollectionsManager:
         name: Optional[str] = None,
         metadata: Optional[dict[str, Any]] = None,
     ) -> CollectionDetails:
-        """Update collection metadata."""
-        async with get_db_connection() as conn:
-            # Check if collection exists
-            existing = await conn.fetchrow("SELECT * FROM collections WHERE uuid = $1", collection_uuid)
-            if not existing:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Collection {collection_uuid} not found",
-                )
-
-            # Update fields
-            updates = []
-            values = []
-            counter = 1
-
-            if name is not None:
-                updates.append(f"name = ${counter}")
-                values.append(name)
-                counter += 1
-
-            if metadata is not None:
-                updates.append(f"metadata = ${counter}")
-                values.append(json.dumps(metadata))
-                counter += 1
+        """Update collection metadata.
 
-            if updates:
-                values.append(collection_uuid)
-                query = f"UPDATE collections SET {', '.join(updates)} WHERE uuid = ${counter}"
-                await conn.execute(query, *values)
-
-            # Return updated details
+        The update and the read of the new row are one statement; a missing
+        collection simply returns no row.
+        """
+        async with get_db_connection() as conn:
             row = await conn.fetchrow(
-                "SELECT uuid, name, table_id, metadata, embedding_model, embedding_dimensions FROM collections WHERE uuid = $1",
+                _UPDATE_COLLECTION_SQL,
                 collection_uuid,
+                name,
+                metadata,
+                record_class=CollectionRecord,
             )
 
-        details: CollectionDetails = {
-            "uuid": str(row["uuid"]),
-            "name": row["name"],
-            "table_id": row["table_id"],
-            "metadata": json.loads(row["metadata"]) if row["metadata"] else {},
-            "embedding_model": row["embedding_model"],
-        }
-
-        if row["embedding_dimensions"]:
-            details["embedding_dimensions"] = row["embedding_dimensions"]
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Collection {collection_uuid} not found",
+            )
 
+        details = row.to_details()
+        _cache_details(collection_uuid, details)
         return details
 
     async def delete_collection(self, collection_uuid: str, user_id: str) -> bool:
-        """Delete a collection and its associated data, including MinIO files."""
+        """Delete a collection and its associated data, including MinIO files.
+
+        The collection row is deleted first, which also yields its table name
+        and makes a concurrent delete of the same collection a no-op. The MinIO
+        objects, the file metadata and the chunk table are then removed
+        concurrently; a failure in one of them is logged and doesn't stop the
+        others.
+        """
+        from ragbackend.services.minio_service import get_minio_service
+        from ragbackend.database.files import delete_files_by_collection
+
         async with get_db_connection() as conn:
-            # Get table_id first
-            row = await conn.fetchrow("SELECT table_id FROM collections WHERE uuid = $1", collection_uuid)
-            if not row:
-                return False
+            row = await conn.fetchrow(
+                "DELETE FROM collections WHERE uuid = $1 RETURNING table_id",
+                collection_uuid,
+            )
+        if not row:
+            return False
 
-            table_id = row["table_id"]
+        table_id = row["table_id"]
+        evict_collection_details(collection_uuid)
+        evict_vectorstore(table_id)
+        evict_search_cache(table_id)
 
-            # Delete all files from MinIO for this collection
-            try:
-                from ragbackend.services.minio_service import get_minio_service
-                from ragbackend.database.files import delete_files_by_collection
-                
-                minio_service = get_minio_service()
-                
-                # Delete files from MinIO using the prefix pattern: user_id/collection_id/
-                minio_prefix = f"{user_id}/{collection_uuid}/"
-                deleted_files = await minio_service.delete_files_by_prefix(minio_prefix)
-                logger.info(f"Deleted {deleted_files} files from MinIO for collection {collection_uuid}")
-                
-                # Delete file metadata from database
-                deleted_metadata = await delete_files_by_collection(collection_uuid, user_id)
-                logger.info(f"Deleted {deleted_metadata} file metadata records for collection {collection_uuid}")
-                
-            except Exception as e:
-                logger.error(f"Failed to delete MinIO files for collection {collection_uuid}: {e}")
-                # Continue with collection deletion even if MinIO cleanup fails
+        async def drop_table() -> None:
+            async with get_db_connection() as conn:
+                await conn.execute(f'DROP TABLE IF EXISTS {_quote_ident(table_id)}')
 
-            # Drop the vectorstore table
-            try:
-                await conn.execute(f"DROP TABLE IF EXISTS vectorstore_{table_id}")
-            except Exception as e:
-                logger.warning(f"Could not drop table vectorstore_{table_id}: {e}")
+        # Files are stored under the prefix user_id/collection_id/
+        minio_prefix = f"{user_id}/{collection_uuid}/"
+        deleted_files, deleted_metadata, dropped = await asyncio.gather(
+            get_minio_service().delete_files_by_prefix(minio_prefix),
+            delete_files_by_collection(collection_uuid, user_id),
+            drop_table(),
+            return_exceptions=True,
+        )
 
-            # Delete from collections metadata
-            result = await conn.execute("DELETE FROM collections WHERE uuid = $1", collection_uuid)
-            
-            # Check if any rows were affected
-            return result != "DELETE 0"
+        if isinstance(deleted_files, BaseException):
+            logger.error("Failed to delete MinIO files for collection %s: %s", collection_uuid, deleted_files)
+        else:
+            logger.info("Deleted %s files from MinIO for collection %s", deleted_files, collection_uuid)
+        if isinstance(deleted_metadata, BaseException):
+            logger.error("Failed to delete file metadata for collection %s: %s", collection_uuid, deleted_metadata)
+        else:
+            logger.info("Deleted %s file metadata records for collection %s", deleted_metadata, collection_uuid)
+        if isinstance(dropped, BaseException):
+            logger.warning("Could not drop table %s: %s", table_id, dropped)
+
+        return True
     
     async def delete(self, collection_uuid: str) -> bool:
         """Delete a collection with user context (wrapper method for API compatibility)."""
@@ -1,14 +1,22 @@
+import asyncio
+import functools
 import logging
+import struct
+import sys
+import uuid
+from array import array
+from collections import OrderedDict
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
-from typing import Any, Optional, Union
+from typing import Any, Optional
 
 import asyncpg
-import sqlalchemy
+import orjson
 from langchain_core.embeddings import Embeddings
 from langchain_postgres import PGEngine, PGVectorStore
-from sqlalchemy import Engine, create_engine
-from sqlalchemy.ext.asyncio import AsyncEngine
+from langchain_postgres.v2.indexes import QueryOptions
+from psycopg.errors import DuplicateTable
+from sqlalchemy.exc import ProgrammingError
 
 from ragbackend import config
 
@@ -16,12 +24,171 @@ logger = logging.getLogger(__name__)
 
 
 _pool: asyncpg.Pool | None = None
+# Serializes pool creation so concurrent first callers don't each open a pool
+_pool_lock = asyncio.Lock()
+
+# Embedding size used for vectorstore tables when none is given
+DEFAULT_VECTOR_SIZE = 512
+
+# Our queries are short parameterized lookups; JIT compilation only adds
+# planning latency to them without any runtime benefit.
+_SERVER_SETTINGS = {"jit": "off", "application_name": "langconnect"}
+
+# Initialized PGVectorStore instances, least recently used first. Building a
+# store inspects the table schema, so it is only done once per collection.
+_VECTORSTORE_CACHE_SIZE = 1024
+_vectorstores: OrderedDict[tuple, PGVectorStore] = OrderedDict()
+# Stores being built, so concurrent misses for one key share the table check
+# and schema inspection
+_vectorstore_builds: dict[tuple, asyncio.Task] = {}
+
+
+# uuids use the binary wire format, 16 bytes instead of 36 characters that the
+# server would parse, but are still handed to and from callers as ``str``.
+def _encode_uuid(value: Any) -> bytes:
+    """Encode a uuid parameter given as ``uuid.UUID`` or any form it accepts."""
+    if isinstance(value, uuid.UUID):
+        return value.bytes
+    return uuid.UUID(value).bytes
+
+
+def _decode_uuid(data: bytes) -> str:
+    h = data.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+# json and jsonb use the binary wire format so rows with either column type can
+# still be written with binary COPY. json's binary form is the document text;
+# jsonb's is the same text behind a one-byte format version.
+_JSONB_VERSION = b"\x01"
+
+
+def _encode_json(value: Any) -> bytes:
+    """Encode a JSON parameter, passing already-serialized strings through."""
+    if isinstance(value, str):
+        return value.encode()
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _decode_json(data: bytes) -> Any:
+    return orjson.loads(data)
+
+
+def _encode_jsonb(value: Any) -> bytes:
+    return _JSONB_VERSION + _encode_json(value)
+
+
+def _decode_jsonb(data: bytes) -> Any:
+    return orjson.loads(memoryview(data)[1:])
+
+
+# pgvector's binary format: uint16 dimensions, uint16 unused, then big-endian
+# float32 (vector) or float16 (halfvec) values.
+_VECTOR_HEADER = struct.Struct(">HH")
+
+
+def _encode_vector(value: list[float]) -> bytes:
+    vector = array("f", value)
+    if sys.byteorder == "little":
+        vector.byteswap()
+    return _VECTOR_HEADER.pack(len(vector), 0) + vector.tobytes()
+
+
+def _decode_vector(data: bytes) -> list[float]:
+    vector = array("f", data[_VECTOR_HEADER.size :])
+    if sys.byteorder == "little":
+        vector.byteswap()
+    return vector.tolist()
+
+
+def _encode_halfvec(value: list[float]) -> bytes:
+    dim = len(value)
+    return _VECTOR_HEADER.pack(dim, 0) + struct.pack(f">{dim}e", *value)
+
+
+def _decode_halfvec(data: bytes) -> list[float]:
+    dim, _ = _VECTOR_HEADER.unpack_from(data)
+    return list(struct.unpack_from(f">{dim}e", data, _VECTOR_HEADER.size))
+
+
+_VECTOR_CODECS = {
+    "vector": (_encode_vector, _decode_vector),
+    "halfvec": (_encode_halfvec, _decode_halfvec),
+}
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Register per-connection type codecs.
+
+    UUID columns are exchanged in binary form but decoded to ``str`` so
+    records already carry ``str`` values and callers don't need to convert
+    them row by row; parameters may be ``str`` or ``uuid.UUID``. JSON and JSONB
+    columns are decoded by the driver, so rows come back as Python objects
+    (the chunk tables store metadata as ``json``). pgvector types
+    use their binary wire format, so embeddings are bound as ``list[float]``
+    without formatting every float as text.
+    """
+    await conn.set_type_codec(
+        "uuid",
+        encoder=_encode_uuid,
+        decoder=_decode_uuid,
+        schema="pg_catalog",
+        format="binary",
+    )
+    await conn.set_type_codec(
+        "json",
+        encoder=_encode_json,
+        decoder=_decode_json,
+        schema="pg_catalog",
+        format="binary",
+    )
+    await conn.set_type_codec(
+        "jsonb",
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
+        schema="pg_catalog",
+        format="binary",
+    )
+    rows = await conn.fetch(
+        """
+        SELECT t.typname, n.nspname
+        FROM pg_type t JOIN pg_namespace n ON n.oid = t.typnamespace
+        WHERE t.typname = ANY($1::text[])
+        """,
+        list(_VECTOR_CODECS),
+    )
+    for row in rows:
+        encoder, decoder = _VECTOR_CODECS[row["typname"]]
+        await conn.set_type_codec(
+            row["typname"],
+            encoder=encoder,
+            decoder=decoder,
+            schema=row["nspname"],
+            format="binary",
+        )
 
 
 async def get_db_pool() -> asyncpg.Pool:
-    """Get the pg connection pool."""
+    """Get the pg connection pool.
+
+    When ``PG_USE_PGBOUNCER=1`` the statement cache is disabled: pgbouncer in
+    transaction mode may route consecutive queries to different backends, which
+    breaks asyncpg's server-side prepared statements. The trade-off is that
+    every query is parsed and planned again by the server.
+    """
     global _pool
-    if _pool is None:
+    if _pool is not None:
+        return _pool
+    async with _pool_lock:
+        if _pool is not None:
+            return _pool
+        # Hot queries are issued with identical SQL text, so a large statement
+        # cache lets asyncpg reuse server-side prepared statements. Chunk
+        # queries name the collection's table, so each collection needs its
+        # own handful of entries.
+        statement_cache_size = (
+            0 if config.PG_USE_PGBOUNCER else config.PG_STATEMENT_CACHE_SIZE
+        )
         # Use parsed components for asyncpg connection
         _pool = await asyncpg.create_pool(
             user=config.POSTGRES_USER,
@@ -29,11 +196,41 @@ async def get_db_pool() -> asyncpg.Pool:
             host=config.POSTGRES_HOST,
             port=config.POSTGRES_PORT,
             database=config.POSTGRES_DB,
+            min_size=config.POSTGRES_POOL_MIN,
+            max_size=config.POSTGRES_POOL_MAX,
+            max_inactive_connection_lifetime=300,
+            command_timeout=config.POSTGRES_COMMAND_TIMEOUT or None,
+            statement_cache_size=statement_cache_size,
+            server_settings=_SERVER_SETTINGS,
+            init=_init_connection,
         )
         logger.info("Database connection pool created using parsed URL components.")
     return _pool
 
 
+# Touch each table the request path reads so relation and index metadata is
+# cached by every backend before the first real request arrives.
+_WARMUP_QUERIES = (
+    "SELECT 1 FROM collections LIMIT 1",
+    "SELECT 1 FROM file_storage LIMIT 1",
+    "SELECT 1 FROM users LIMIT 1",
+)
+
+
+async def warmup_db_pool() -> None:
+    """Open and prime ``POSTGRES_POOL_MIN`` connections at startup."""
+    pool = await get_db_pool()
+
+    async def prime() -> None:
+        async with pool.acquire() as conn:
+            for query in _WARMUP_QUERIES:
+                await conn.execute(query)
+
+    # Acquire concurrently so each task is handed a different connection
+    await asyncio.gather(*(prime() for _ in range(config.POSTGRES_POOL_MIN)))
+    logger.info("Warmed up %s database connections.", config.POSTGRES_POOL_MIN)
+
+
 async def close_db_pool():
     """Close the pg connection pool."""
     global _pool
@@ -44,15 +241,17 @@ async def close_db_pool():
 
 @asynccontextmanager
 async def get_db_connection() -> AsyncGenerator[asyncpg.Connection, None]:
-    """Get a connection from the pool."""
+    """Get a connection from the pool.
+
+    The connection is released back to the pool on exit; it must not be closed
+    here or every request would pay for a fresh connection handshake.
+    """
     pool = await get_db_pool()
     async with pool.acquire() as conn:
-        try:
-            yield conn
-        finally:
-            await conn.close()
+        yield conn
 
 
+@functools.lru_cache(maxsize=1)
 def get_vectorstore_engine(
     host: str = config.POSTGRES_HOST,
     port: str = config.POSTGRES_PORT,
@@ -60,14 +259,59 @@ def get_vectorstore_engine(
     password: str = config.POSTGRES_PASSWORD,
     dbname: str = config.POSTGRES_DB,
 ) -> PGEngine:
-    """Creates and returns a PGEngine for PostgreSQL with pgvector support."""
+    """Creates and returns a PGEngine for PostgreSQL with pgvector support.
+
+    The engine owns a connection pool and is safe to share, so it is created
+    once and reused.
+
+    PGEngine wraps an async SQLAlchemy engine on psycopg3, so every
+    PGVectorStore operation (including embedding the query through
+    ``aembed_query``) runs without blocking the event loop.
+
+    Its pool is sized by VECTORSTORE_POOL_MIN/MAX, separately from the asyncpg
+    pool: most queries go through asyncpg, and sharing POSTGRES_POOL_MAX would
+    let one worker open twice that many server connections. Connections are
+    pinged on checkout so ones dropped by the server while idle are replaced
+    instead of failing the request.
+    """
     # Updated connection string to use psycopg3 (psycopg://)
     connection_string = f"postgresql+psycopg://{user}:{password}@{host}:{port}/{dbname}"
-    engine = PGEngine.from_connection_string(url=connection_string)
+    engine = PGEngine.from_connection_string(
+        url=connection_string,
+        pool_size=config.VECTORSTORE_POOL_MIN,
+        max_overflow=max(
+            config.VECTORSTORE_POOL_MAX - config.VECTORSTORE_POOL_MIN, 0
+        ),
+        pool_pre_ping=True,
+        pool_recycle=1800,
+    )
     return engine
 
 
-DBConnection = Union[sqlalchemy.engine.Engine, str]
+async def _build_vectorstore(
+    collection_name: str,
+    embeddings: Embeddings,
+    engine: PGEngine,
+    vector_size: int,
+    index_query_options: Optional[QueryOptions],
+) -> PGVectorStore:
+    # Initialize the vectorstore table if it doesn't exist
+    try:
+        await engine.ainit_vectorstore_table(
+            table_name=collection_name,
+            vector_size=vector_size,
+        )
+    except ProgrammingError as e:
+        if not isinstance(e.orig, DuplicateTable):
+            raise
+
+    # Create the vectorstore using the new async PGVectorStore
+    return await PGVectorStore.create(
+        engine=engine,
+        table_name=collection_name,
+        embedding_service=embeddings,
+        index_query_options=index_query_options,
+    )
 
 
 async def get_vectorstore(
@@ -75,10 +319,18 @@ async def get_vectorstore(
     embeddings: Optional[Embeddings] = None,
     engine: Optional[PGEngine] = None,
     collection_metadata: Optional[dict[str, Any]] = None,
-    vector_size: int = 512,
+    vector_size: int = DEFAULT_VECTOR_SIZE,
+    index_query_options: Optional[QueryOptions] = None,
 ) -> PGVectorStore:
     """Initializes and returns a PGVectorStore for a specific collection,
     using an existing engine or creating one from connection parameters.
+
+    ``index_query_options`` are applied with ``SET LOCAL`` inside the
+    transaction of each search, so they never leak to other queries.
+
+    Stores are cached per collection, embeddings, engine and query options,
+    and concurrent requests for a store that isn't cached yet wait for a single
+    build; call ``evict_vectorstore`` when the underlying table is dropped.
     """
     if engine is None:
         engine = get_vectorstore_engine()
@@ -86,17 +338,36 @@ async def get_vectorstore(
     if embeddings is None:
         embeddings = config.get_default_embeddings()
 
-    # Initialize the vectorstore table if it doesn't exist
-    await engine.ainit_vectorstore_table(
-        table_name=collection_name,
-        vector_size=vector_size,
+    options_key = (
+        tuple(index_query_options.to_parameter()) if index_query_options else ()
     )
+    key = (collection_name, id(embeddings), id(engine), options_key)
+    store = _vectorstores.get(key)
+    if store is not None:
+        _vectorstores.move_to_end(key)
+        return store
 
-    # Create the vectorstore using the new async PGVectorStore
-    store = await PGVectorStore.create(
-        engine=engine,
-        table_name=collection_name,
-        embedding_service=embeddings,
-    )
+    task = _vectorstore_builds.get(key)
+    if task is None:
+        task = asyncio.ensure_future(
+            _build_vectorstore(
+                collection_name, embeddings, engine, vector_size, index_query_options
+            )
+        )
+        _vectorstore_builds[key] = task
+        task.add_done_callback(lambda _: _vectorstore_builds.pop(key, None))
+    # Shield the shared build so one cancelled request doesn't fail the others
+    store = await asyncio.shield(task)
+
+    _vectorstores[key] = store
+    _vectorstores.move_to_end(key)
+    if len(_vectorstores) > _VECTORSTORE_CACHE_SIZE:
+        _vectorstores.popitem(last=False)
     return store
 
+
+def evict_vectorstore(collection_name: str) -> None:
+    """Drop every cached PGVectorStore for the given collection table."""
+    for key in [key for key in _vectorstores if key[0] == collection_name]:
+        del _vectorstores[key]
+
@@ -3,7 +3,6 @@
 import logging
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-import json
 
 from ragbackend.database.connection import get_db_connection
 
@@ -55,11 +54,77 @@ async def create_files_table() -> bool:
                 ON file_storage(user_id, collection_id);
             """)
             
+            # Ordered indexes for the paginated listings: the planner walks them
+            # in upload_time order and stops after LIMIT + OFFSET rows instead
+            # of sorting every matching row.
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_file_storage_user_collection_upload 
+                ON file_storage(user_id, collection_id, upload_time DESC);
+            """)
+            
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_file_storage_user_upload 
+                ON file_storage(user_id, upload_time DESC);
+            """)
+            
+            # Per-user byte totals kept current by a trigger, so storage stats
+            # are a primary key lookup instead of a SUM over every file row.
+            # Existing rows are counted once, when the trigger is installed.
+            async with conn.transaction():
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS file_storage_usage (
+                        user_id VARCHAR(255) PRIMARY KEY,
+                        total_bytes BIGINT NOT NULL DEFAULT 0
+                    );
+                """)
+                
+                await conn.execute("""
+                    CREATE OR REPLACE FUNCTION file_storage_track_usage()
+                    RETURNS trigger AS $$
+                    BEGIN
+                        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                            UPDATE file_storage_usage
+                            SET total_bytes = total_bytes - OLD.file_size
+                            WHERE user_id = OLD.user_id;
+                        END IF;
+                        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                            INSERT INTO file_storage_usage (user_id, total_bytes)
+                            VALUES (NEW.user_id, NEW.file_size)
+                            ON CONFLICT (user_id) DO UPDATE
+                            SET total_bytes = file_storage_usage.total_bytes
+                                + EXCLUDED.total_bytes;
+                        END IF;
+                        RETURN NULL;
+                    END;
+                    $$ LANGUAGE plpgsql;
+                """)
+                
+                await conn.execute("""
+                    DO $$
+                    BEGIN
+                        IF NOT EXISTS (
+                            SELECT 1 FROM pg_trigger
+                            WHERE tgname = 'file_storage_usage_trigger'
+                        ) THEN
+                            CREATE TRIGGER file_storage_usage_trigger
+                            AFTER INSERT OR DELETE OR UPDATE OF user_id, file_size
+                            ON file_storage
+                            FOR EACH ROW EXECUTE FUNCTION file_storage_track_usage();
+                            
+                            INSERT INTO file_storage_usage (user_id, total_bytes)
+                            SELECT user_id, SUM(file_size)
+                            FROM file_storage GROUP BY user_id
+                            ON CONFLICT (user_id) DO NOTHING;
+                        END IF;
+                    END
+                    $$;
+                """)
+            
             logger.info("Files metadata table created successfully.")
             return True
             
     except Exception as e:
-        logger.error(f"Failed to create files metadata table: {e}")
+        logger.error("Failed to create files metadata table: %s", e)
         return False
 
 
@@ -95,15 +160,15 @@ async def insert_file_metadata(file_metadata: Dict[str, Any]) -> Optional[int]:
                 file_metadata['object_path'],
                 file_metadata['bucket'],
                 file_metadata.get('etag'),
-                json.dumps(file_metadata.get('metadata', {}))
+                file_metadata.get('metadata', {})
             )
             
             if result:
-                logger.info(f"File metadata inserted with ID: {result['id']}")
+                logger.info("File metadata inserted with ID: %s", result['id'])
                 return result['id']
             
     except Exception as e:
-        logger.error(f"Failed to insert file metadata: {e}")
+        logger.error("Failed to insert file metadata: %s", e)
         return None
 
 
@@ -129,10 +194,72 @@ async def get_file_metadata(file_id: str) -> Optional[Dict[str, Any]]:
                 return dict(result)
             
     except Exception as e:
-        logger.error(f"Failed to get file metadata for {file_id}: {e}")
+        logger.error("Failed to get file metadata for %s: %s", file_id, e)
         return None
 
 
+async def get_file_metadata_for_user(
+    file_id: str, user_id: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Get file metadata by file_id if the file belongs to a user.
+    
+    Files owned by someone else are treated as missing, so callers can't
+    probe for other users' file IDs.
+    
+    Args:
+        file_id: The unique file identifier
+        user_id: User identifier that must own the file
+        
+    Returns:
+        File metadata dictionary or None if the user has no such file
+    """
+    try:
+        async with get_db_connection() as conn:
+            query = """
+                SELECT * FROM file_storage WHERE file_id = $1 AND user_id = $2;
+            """
+            
+            result = await conn.fetchrow(query, file_id, user_id)
+            
+            if result:
+                return dict(result)
+            
+    except Exception as e:
+        logger.error("Failed to get file metadata for %s: %s", file_id, e)
+        return None
+
+
+async def get_files_metadata(
+    file_ids: List[str], user_id: str
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Get metadata for several files owned by a user in a single query.
+    
+    Args:
+        file_ids: File identifiers to look up
+        user_id: User identifier; files owned by other users are skipped
+        
+    Returns:
+        Dictionary mapping file_id to its metadata; unknown ids are omitted
+    """
+    if not file_ids:
+        return {}
+    try:
+        async with get_db_connection() as conn:
+            query = """
+                SELECT * FROM file_storage
+                WHERE file_id = ANY($1::text[]) AND user_id = $2;
+            """
+            
+            rows = await conn.fetch(query, list(set(file_ids)), user_id)
+            return {row['file_id']: dict(row) for row in rows}
+            
+    except Exception as e:
+        logger.error("Failed to get file metadata for %s files: %s", len(file_ids), e)
+        return {}
+
+
 async def get_files_by_collection(
     collection_id: str, 
     user_id: str,
@@ -165,7 +292,7 @@ async def get_files_by_collection(
             return [dict(row) for row in results]
             
     except Exception as e:
-        logger.error(f"Failed to get files for collection {collection_id}: {e}")
+        logger.error("Failed to get files for collection %s: %s", collection_id, e)
         return []
 
 
@@ -199,7 +326,7 @@ async def get_files_by_user(
             return [dict(row) for row in results]
             
     except Exception as e:
-        logger.error(f"Failed to get files for user {user_id}: {e}")
+        logger.error("Failed to get files for user %s: %s", user_id, e)
         return []
 
 
@@ -221,17 +348,52 @@ async def delete_file_metadata(file_id: str) -> bool:
             
             # Check if any rows were affected
             if result == "DELETE 1":
-                logger.info(f"File metadata deleted for file_id: {file_id}")
+                logger.info("File metadata deleted for file_id: %s", file_id)
                 return True
             else:
-                logger.warning(f"No file metadata found for file_id: {file_id}")
+                logger.warning("No file metadata found for file_id: %s", file_id)
                 return False
                 
     except Exception as e:
-        logger.error(f"Failed to delete file metadata for {file_id}: {e}")
+        logger.error("Failed to delete file metadata for %s: %s", file_id, e)
         return False
 
 
+async def delete_file_metadata_for_user(
+    file_id: str, user_id: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Delete file metadata owned by a user in a single round-trip.
+    
+    Files owned by someone else are treated as missing, so callers can't
+    probe for other users' file IDs.
+    
+    Args:
+        file_id: The unique file identifier
+        user_id: User identifier that must own the file
+        
+    Returns:
+        Dict with ``object_path`` and ``original_filename`` of the deleted
+        row, or None if the user has no such file
+    """
+    try:
+        async with get_db_connection() as conn:
+            query = """
+                DELETE FROM file_storage
+                WHERE file_id = $1 AND user_id = $2
+                RETURNING object_path, original_filename;
+            """
+            
+            result = await conn.fetchrow(query, file_id, user_id)
+            
+            if result:
+                return dict(result)
+            
+    except Exception as e:
+        logger.error("Failed to delete file metadata for %s: %s", file_id, e)
+        return None
+
+
 async def delete_files_by_collection(collection_id: str, user_id: str) -> int:
     """
     Delete all file metadata for a specific collection and user.
@@ -245,15 +407,7 @@ async def delete_files_by_collection(collection_id: str, user_id: str) -> int:
     """
     try:
         async with get_db_connection() as conn:
-            # First get the list of files to be deleted for logging
-            select_query = """
-                SELECT file_id, object_path FROM file_storage 
-                WHERE collection_id = $1 AND user_id = $2;
-            """
-            
-            files_to_delete = await conn.fetch(select_query, collection_id, user_id)
-            
-            # Delete the files
+            # The command tag carries the row count, so no rows are sent back
             delete_query = """
                 DELETE FROM file_storage 
                 WHERE collection_id = $1 AND user_id = $2;
@@ -264,12 +418,12 @@ async def delete_files_by_collection(collection_id: str, user_id: str) -> int:
             # Extract the number of deleted rows from the result
             deleted_count = int(result.split()[-1]) if result.startswith("DELETE") else 0
             
-            logger.info(f"Deleted {deleted_count} file metadata records for collection {collection_id}")
+            logger.info("Deleted %s file metadata records for collection %s", deleted_count, collection_id)
             
             return deleted_count
             
     except Exception as e:
-        logger.error(f"Failed to delete files for collection {collection_id}: {e}")
+        logger.error("Failed to delete files for collection %s: %s", collection_id, e)
         return 0
 
 
@@ -300,7 +454,7 @@ async def update_file_metadata(
             for key, value in updates.items():
                 if key in ['filename', 'content_type', 'file_size', 'metadata']:
                     set_clauses.append(f"{key} = ${param_count}")
-                    values.append(value if key != 'metadata' else json.dumps(value))
+                    values.append(value)
                     param_count += 1
             
             if not set_clauses:
@@ -323,14 +477,14 @@ async def update_file_metadata(
             result = await conn.execute(query, *values)
             
             if result == "UPDATE 1":
-                logger.info(f"File metadata updated for file_id: {file_id}")
+                logger.info("File metadata updated for file_id: %s", file_id)
                 return True
             else:
-                logger.warning(f"No file metadata found for file_id: {file_id}")
+                logger.warning("No file metadata found for file_id: %s", file_id)
                 return False
                 
     except Exception as e:
-        logger.error(f"Failed to update file metadata for {file_id}: {e}")
+        logger.error("Failed to update file metadata for %s: %s", file_id, e)
         return False
 
 
@@ -357,7 +511,7 @@ async def get_file_count_by_collection(collection_id: str, user_id: str) -> int:
             return result['count'] if result else 0
             
     except Exception as e:
-        logger.error(f"Failed to get file count for collection {collection_id}: {e}")
+        logger.error("Failed to get file count for collection %s: %s", collection_id, e)
         return 0
 
 
@@ -373,15 +527,15 @@ async def get_total_file_size_by_user(user_id: str) -> int:
     """
     try:
         async with get_db_connection() as conn:
+            # Maintained by file_storage_usage_trigger, see create_files_table
             query = """
-                SELECT COALESCE(SUM(file_size), 0) as total_size 
-                FROM file_storage WHERE user_id = $1;
+                SELECT total_bytes FROM file_storage_usage WHERE user_id = $1;
             """
             
-            result = await conn.fetchrow(query, user_id)
+            total_size = await conn.fetchval(query, user_id)
             
-            return result['total_size'] if result else 0
+            return total_size or 0
             
     except Exception as e:
-        logger.error(f"Failed to get total file size for user {user_id}: {e}")
+        logger.error("Failed to get total file size for user %s: %s", user_id, e)
         return 0 
\ No newline at end of file
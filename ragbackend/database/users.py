@@ -1,5 +1,6 @@
 """User database operations."""
 
+import asyncio
 import asyncpg
 import logging
 from datetime import datetime
@@ -97,6 +98,16 @@ async def update_user_last_login(user_id: str):
         """, user_id)
 
 
+async def update_user_password_hash(user_id: str, hashed_password: str):
+    """Replace a user's stored password hash."""
+    async with get_db_connection() as conn:
+        await conn.execute("""
+            UPDATE users 
+            SET hashed_password = $2
+            WHERE id = $1
+        """, user_id, hashed_password)
+
+
 async def create_default_admin_user():
     """Create default admin user if it doesn't exist and password is provided."""
     from ragbackend import config
@@ -111,17 +122,19 @@ async def create_default_admin_user():
         # Check if admin user already exists
         existing_user = await get_user_by_username(config.DEFAULT_ADMIN_USERNAME)
         if existing_user:
-            logger.info(f"Admin user '{config.DEFAULT_ADMIN_USERNAME}' already exists")
+            logger.info("Admin user '%s' already exists", config.DEFAULT_ADMIN_USERNAME)
             return
         
         # Check if admin email already exists
         existing_email = await get_user_by_email(config.DEFAULT_ADMIN_EMAIL)
         if existing_email:
-            logger.warning(f"Email '{config.DEFAULT_ADMIN_EMAIL}' already exists, skipping admin user creation")
+            logger.warning("Email '%s' already exists, skipping admin user creation", config.DEFAULT_ADMIN_EMAIL)
             return
         
         # Create admin user
-        hashed_password = get_password_hash(config.DEFAULT_ADMIN_PASSWORD)
+        hashed_password = await asyncio.to_thread(
+            get_password_hash, config.DEFAULT_ADMIN_PASSWORD
+        )
         admin_user = await create_user(
             email=config.DEFAULT_ADMIN_EMAIL,
             username=config.DEFAULT_ADMIN_USERNAME,
@@ -129,9 +142,9 @@ async def create_default_admin_user():
             full_name=config.DEFAULT_ADMIN_FULL_NAME
         )
         
-        logger.info(f"Default admin user '{config.DEFAULT_ADMIN_USERNAME}' created successfully")
+        logger.info("Default admin user '%s' created successfully", config.DEFAULT_ADMIN_USERNAME)
         return admin_user
         
     except Exception as e:
-        logger.error(f"Failed to create default admin user: {e}")
+        logger.error("Failed to create default admin user: %s", e)
         raise 
\ No newline at end of file
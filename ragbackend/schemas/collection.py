@@ -1,8 +1,8 @@
-import datetime
+from collections.abc import Mapping
 from typing import Any, Union
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field
 
 # =====================
 # Collection Schemas
@@ -31,7 +31,8 @@ class CollectionResponse(BaseModel):
     """Schema for representing a collection from PGVector."""
 
     # PGVector table has uuid (id), name (str), and cmetadata (JSONB)
-    # We get these from list/get db functions
+    # We get these from list/get db functions. Database rows carry the uuid
+    # as str; UUID objects are serialized to the same string by pydantic-core.
     uuid: Union[str, UUID] = Field(
         ..., description="The unique identifier of the collection in PGVector."
     )
@@ -40,65 +41,19 @@ class CollectionResponse(BaseModel):
         default_factory=dict, description="Metadata associated with the collection."
     )
 
-    @field_validator('uuid')
-    @classmethod
-    def validate_uuid(cls, v):
-        """Convert UUID to string if needed."""
-        if isinstance(v, UUID):
-            return str(v)
-        return v
-
-    class Config:
-        # Allows creating model from dict like
-        # {'uuid': '...', 'name': '...', 'metadata': {...}}
-        from_attributes = True
-
-
-# =====================
-# Document Schemas
-# =====================
-
-
-class DocumentBase(BaseModel):
-    page_content: str
-    metadata: dict[str, Any] = Field(default_factory=dict)
-
+    # Allows creating model from dict like
+    # {'uuid': '...', 'name': '...', 'metadata': {...}}
+    model_config = ConfigDict(from_attributes=True)
 
-class DocumentCreate(DocumentBase):
-    collection_id: Union[str, UUID]
-    embedding: list[float] | None = (
-        None  # Embedding can be added during creation or later
-    )
-
-    @field_validator('collection_id')
     @classmethod
-    def validate_collection_id(cls, v):
-        """Convert UUID to string if needed."""
-        if isinstance(v, UUID):
-            return str(v)
-        return v
-
-
-class DocumentUpdate(BaseModel):
-    page_content: str | None = None
-    metadata: dict[str, Any] | None = None
-    embedding: list[float] | None = None
-
-
-class DocumentResponse(DocumentBase):
-    id: Union[str, UUID]
-    collection_id: Union[str, UUID]
-    embedding: list[float] | None = None  # Represent embedding as list of floats
-    created_at: datetime.datetime
-    updated_at: datetime.datetime
-
-    @field_validator('id', 'collection_id')
-    @classmethod
-    def validate_uuid_fields(cls, v):
-        """Convert UUID to string if needed."""
-        if isinstance(v, UUID):
-            return str(v)
-        return v
-
-    class Config:
-        from_attributes = True  # Pydantic v2 way
+    def from_row(cls, row: Mapping[str, Any]) -> "CollectionResponse":
+        """Build a response from a trusted collections row without validation.
+
+        Only pass rows read from our own ``collections`` table: the driver has
+        already typed them (uuid as str, metadata decoded from JSONB), so
+        running the validators again is wasted work. Never use this for
+        client input.
+        """
+        return cls.model_construct(
+            uuid=row["uuid"], name=row["name"], metadata=row["metadata"] or {}
+        )
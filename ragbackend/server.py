@@ -11,11 +11,7 @@ from ragbackend.api.files import router as files_router
 from ragbackend.config import ALLOWED_ORIGINS
 from ragbackend.database.collections import CollectionsManager
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+# Logging is configured once in ragbackend/__init__.py
 
 logger = logging.getLogger(__name__)
 
@@ -49,7 +45,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     try:
         await create_default_admin_user()
     except Exception as e:
-        logger.error(f"Failed to create default admin user: {e}")
+        logger.error("Failed to create default admin user: %s", e)
     
     # Create files metadata table
     from ragbackend.database.files import create_files_table
@@ -59,8 +55,17 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     else:
         logger.warning("Failed to create files metadata table.")
     
+    # Prime the connection pool so the first requests don't pay for it
+    from ragbackend.database.connection import warmup_db_pool
+    try:
+        await warmup_db_pool()
+    except Exception as e:
+        logger.warning("Failed to warm up database connection pool: %s", e)
+    
     yield
     logger.info("App is shutting down. Stopping background worker...")
+    from ragbackend.services.document_processor import shutdown_parse_pool
+    shutdown_parse_pool()
 
 
 APP = FastAPI(
@@ -1,40 +1,233 @@
+import asyncio
+import functools
+import hashlib
 import logging
+import multiprocessing
+import os
+import pickle
+import tempfile
 import uuid
-from typing import Optional, Dict, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Literal, Optional, Tuple
 
 from fastapi import UploadFile
-from langchain_community.document_loaders.parsers import BS4HTMLParser, PDFMinerParser
-from langchain_community.document_loaders.parsers.generic import MimeTypeBasedParser
-from langchain_community.document_loaders.parsers.msword import MsWordParser
-from langchain_community.document_loaders.parsers.txt import TextParser
+from langchain_core.document_loaders import BaseBlobParser
 from langchain_core.documents.base import Blob, Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from ragbackend import config
+from ragbackend.services import ingest_cache
 from ragbackend.services.minio_service import get_minio_service
 from ragbackend.database.files import insert_file_metadata
 
 LOGGER = logging.getLogger(__name__)
 
 # Document Parser Configuration
-HANDLERS = {
-    "application/pdf": PDFMinerParser(),
-    "text/plain": TextParser(),
-    "text/html": BS4HTMLParser(),
-    "application/msword": MsWordParser(),
+#
+# Parsers are imported and built on first use: the PDF, HTML and Word parsers
+# pull in heavy modules that text-only deployments (and every freshly spawned
+# parse worker) would otherwise load at startup.
+
+
+@functools.cache
+def _pdf_parser() -> BaseBlobParser:
+    from langchain_community.document_loaders.parsers.pdf import PDFMinerParser
+
+    return PDFMinerParser()
+
+
+@functools.cache
+def _text_parser() -> BaseBlobParser:
+    from langchain_community.document_loaders.parsers.txt import TextParser
+
+    return TextParser()
+
+
+@functools.cache
+def _html_parser() -> BaseBlobParser:
+    from langchain_community.document_loaders.parsers.html.bs4 import BS4HTMLParser
+
+    return BS4HTMLParser()
+
+
+@functools.cache
+def _msword_parser() -> BaseBlobParser:
+    from langchain_community.document_loaders.parsers.msword import MsWordParser
+
+    return MsWordParser()
+
+
+HANDLERS: dict[str, Callable[[], BaseBlobParser]] = {
+    "application/pdf": _pdf_parser,
+    "text/plain": _text_parser,
+    "text/html": _html_parser,
+    "application/msword": _msword_parser,
     "application/vnd.openxmlformats-officedocument.wordprocessingml.document": (
-        MsWordParser()
+        _msword_parser
     ),
 }
 
-SUPPORTED_MIMETYPES = sorted(HANDLERS.keys())
+SUPPORTED_MIMETYPES = tuple(sorted(HANDLERS))
+
+
+def _split_on_separator(
+    text: str, separator: str, keep_separator: bool | Literal["start", "end"]
+) -> list[str]:
+    """Split on a literal separator the way LangChain's regex split does."""
+    if not separator:
+        return list(text)
+    parts = text.split(separator)
+    if keep_separator == "end":
+        splits = [part + separator for part in parts[:-1]] + parts[-1:]
+    elif keep_separator:
+        splits = parts[:1] + [separator + part for part in parts[1:]]
+    else:
+        splits = parts
+    return [split for split in splits if split]
+
+
+class LiteralTextSplitter(RecursiveCharacterTextSplitter):
+    """Recursive character splitter for plain-string separators.
+
+    The stock splitter escapes every separator into a regex and runs
+    ``re.search``/``re.split`` at each level of recursion. With literal
+    separators, ``in`` and ``str.split`` find the same boundaries without the
+    regex engine, producing identical chunks.
+    """
+
+    def __init__(self, separators: list[str] | None = None, **kwargs: Any) -> None:
+        super().__init__(separators=separators, is_separator_regex=False, **kwargs)
+
+    def _split_text(self, text: str, separators: list[str]) -> list[str]:
+        final_chunks = []
+        # Use the first separator present in the text
+        separator = separators[-1]
+        new_separators = []
+        for i, candidate in enumerate(separators):
+            if not candidate:
+                separator = candidate
+                break
+            if candidate in text:
+                separator = candidate
+                new_separators = separators[i + 1 :]
+                break
+
+        splits = _split_on_separator(text, separator, self._keep_separator)
+
+        # Merge small splits, recursively splitting the ones that are too long
+        good_splits = []
+        merge_separator = "" if self._keep_separator else separator
+        for split in splits:
+            if self._length_function(split) < self._chunk_size:
+                good_splits.append(split)
+                continue
+            if good_splits:
+                final_chunks.extend(self._merge_splits(good_splits, merge_separator))
+                good_splits = []
+            if not new_separators:
+                final_chunks.append(split)
+            else:
+                final_chunks.extend(self._split_text(split, new_separators))
+        if good_splits:
+            final_chunks.extend(self._merge_splits(good_splits, merge_separator))
+        return final_chunks
 
-MIMETYPE_BASED_PARSER = MimeTypeBasedParser(
-    handlers=HANDLERS,
-    fallback_parser=None,
-)
 
 # Text Splitter
-TEXT_SPLITTER = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+TEXT_SPLITTER = LiteralTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+
+# Uploads larger than this are spooled to a temporary file and parsed from
+# disk instead of being read into memory as a whole
+SPOOL_THRESHOLD = 8 * 1024 * 1024
+_READ_CHUNK_SIZE = 1024 * 1024
+
+
+def _parse_and_split(blob: Blob) -> list[Document]:
+    """Parse a blob lazily and split each parsed document as it is produced.
+
+    Only one parsed document (e.g. a PDF page) is held at a time besides the
+    resulting chunks.
+    """
+    try:
+        parser = HANDLERS[blob.mimetype]()
+    except KeyError:
+        raise ValueError(f"Unsupported mime type: {blob.mimetype}") from None
+    split_docs: list[Document] = []
+    for doc in parser.lazy_parse(blob):
+        split_docs.extend(TEXT_SPLITTER.split_documents([doc]))
+    return split_docs
+
+
+def _ingest_cache_key(content_hash: "hashlib._Hash", mimetype: str) -> bytes:
+    """Key the ingest cache on the upload bytes and everything shaping the chunks."""
+    content_hash.update(f"\0{mimetype}\0{CHUNK_SIZE}\0{CHUNK_OVERLAP}".encode())
+    return content_hash.digest()
+
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """Get the process pool used for parsing, creating it on first use."""
+    global _parse_pool
+    if _parse_pool is None:
+        # Spawn rather than fork: the server process runs an event loop and
+        # background threads whose locks must not be copied into workers.
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=config.PARSE_WORKERS or os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _parse_pool
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the parsing worker processes."""
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(cancel_futures=True)
+        _parse_pool = None
+
+
+async def _parse_and_split_off_loop(blob: Blob) -> list[Document]:
+    """Run the CPU-bound parsing and splitting outside the event loop.
+
+    Work goes to a process pool so parsing scales with CPU cores; if the blob
+    or its results can't cross the process boundary, a thread is used instead.
+    """
+    global _parse_pool
+    loop = asyncio.get_running_loop()
+    pool = _get_parse_pool()
+    try:
+        return await loop.run_in_executor(pool, _parse_and_split, blob)
+    except (pickle.PicklingError, BrokenProcessPool) as e:
+        if isinstance(e, BrokenProcessPool) and _parse_pool is pool:
+            # A worker died (e.g. OOM-killed); a broken pool rejects every
+            # later submit, so replace it on the next upload.
+            _parse_pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+        LOGGER.warning("Parsing in a worker process failed, using a thread: %s", e)
+        return await asyncio.to_thread(_parse_and_split, blob)
+
+
+async def _split_with_cache(
+    blob: Blob, content_hash: "hashlib._Hash", mimetype: str
+) -> list[Document]:
+    """Parse and split a blob, reusing the chunks of an identical earlier upload."""
+    if not ingest_cache.is_enabled():
+        return await _parse_and_split_off_loop(blob)
+
+    key = _ingest_cache_key(content_hash, mimetype)
+    split_docs = await ingest_cache.get_cached_documents(key)
+    if split_docs is not None:
+        LOGGER.info("Reusing %s cached chunks for identical upload", len(split_docs))
+        return split_docs
+
+    split_docs = await _parse_and_split_off_loop(blob)
+    await ingest_cache.cache_documents(key, split_docs)
+    return split_docs
 
 
 async def process_document(
@@ -57,6 +250,11 @@ async def process_document(
     Returns:
         Tuple of (processed documents, file metadata from MinIO storage)
     """
+    # Reject unsupported files before anything is stored for them
+    mimetype = file.content_type or "text/plain"
+    if mimetype not in HANDLERS:
+        raise ValueError(f"Unsupported file type: {mimetype}")
+
     # Generate a unique ID for this file processing instance
     file_id = str(uuid.uuid4())
     
@@ -74,50 +272,50 @@ async def process_document(
                 db_file_id = await insert_file_metadata(file_metadata)
                 if db_file_id:
                     file_metadata['db_id'] = db_file_id
-                    LOGGER.info(f"File stored in MinIO and metadata saved to DB: {file.filename}")
+                    LOGGER.info("File stored in MinIO and metadata saved to DB: %s", file.filename)
                 else:
-                    LOGGER.warning(f"File stored in MinIO but failed to save metadata to DB: {file.filename}")
+                    LOGGER.warning("File stored in MinIO but failed to save metadata to DB: %s", file.filename)
             
         except Exception as e:
-            LOGGER.error(f"Failed to store original file in MinIO: {e}")
+            LOGGER.error("Failed to store original file in MinIO: %s", e)
             # Continue with processing even if MinIO storage fails
     
-    # Read file contents for processing
-    contents = await file.read()
-    blob = Blob(data=contents, mimetype=file.content_type or "text/plain")
-
-    docs = MIMETYPE_BASED_PARSER.parse(blob)
-
-    # Add provided metadata to each document
-    if metadata:
-        for doc in docs:
-            # Ensure metadata attribute exists and is a dict
-            if not hasattr(doc, "metadata") or not isinstance(doc.metadata, dict):
-                doc.metadata = {}
-            # Update with provided metadata, preserving existing keys if not overridden
-            doc.metadata.update(metadata)
-
-    # Split documents
-    split_docs = TEXT_SPLITTER.split_documents(docs)
+    # Parse and split the file contents
+    content_hash = hashlib.sha256()
+    await file.seek(0)
+    if file.size is not None and file.size <= SPOOL_THRESHOLD:
+        data = await file.read()
+        content_hash.update(data)
+        split_docs = await _split_with_cache(
+            Blob(data=data, mimetype=mimetype), content_hash, mimetype
+        )
+    else:
+        with tempfile.NamedTemporaryFile() as spooled:
+            while chunk := await file.read(_READ_CHUNK_SIZE):
+                content_hash.update(chunk)
+                spooled.write(chunk)
+            spooled.flush()
+            # Don't leak the temporary path into the documents' source
+            blob = Blob.from_path(
+                spooled.name, mime_type=mimetype, metadata={"source": None}
+            )
+            split_docs = await _split_with_cache(blob, content_hash, mimetype)
 
-    # Add the generated file_id and MinIO info to all split documents' metadata
+    # Build the metadata shared by every chunk once, then apply it per chunk.
+    # Provided metadata overrides parser keys; file_id always wins.
+    shared_metadata = dict(metadata) if metadata else {}
+    shared_metadata["file_id"] = file_id
+    # Add MinIO file information if available
+    if file_metadata:
+        shared_metadata["original_file"] = {
+            "object_path": file_metadata.get("object_path"),
+            "filename": file_metadata.get("filename"),
+            "size": file_metadata.get("size"),
+            "content_type": file_metadata.get("content_type"),
+            "upload_time": file_metadata.get("upload_time")
+        }
     for split_doc in split_docs:
-        if not hasattr(split_doc, "metadata") or not isinstance(
-            split_doc.metadata, dict
-        ):
-            split_doc.metadata = {}  # Initialize if it doesn't exist
-        
-        split_doc.metadata["file_id"] = file_id  # Store as string for compatibility
-        
-        # Add MinIO file information if available
-        if file_metadata:
-            split_doc.metadata["original_file"] = {
-                "object_path": file_metadata.get("object_path"),
-                "filename": file_metadata.get("filename"),
-                "size": file_metadata.get("size"),
-                "content_type": file_metadata.get("content_type"),
-                "upload_time": file_metadata.get("upload_time")
-            }
+        split_doc.metadata.update(shared_metadata)
 
     return split_docs, file_metadata
 
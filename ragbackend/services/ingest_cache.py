@@ -0,0 +1,123 @@
+"""On-disk cache of parsed and split uploads.
+
+Entries map a key derived from the upload bytes and the splitter settings to
+the resulting chunks, so re-uploading an identical file skips parsing and
+splitting altogether. The cache is enabled by setting ``INGEST_CACHE_PATH``
+to a directory.
+
+Each entry is its own file holding the zlib-compressed JSON of the chunks'
+``page_content`` and ``metadata``, so reading one never executes code. Entries
+are written to a temporary file and renamed into place, which keeps the cache
+safe to share between worker processes. Once the directory grows past
+``INGEST_CACHE_MAX_MB`` the least recently used entries are removed.
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+import zlib
+from typing import Optional
+
+import orjson
+from langchain_core.documents.base import Document
+
+from ragbackend import config
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = ".json.z"
+
+
+def _entry_path(key: bytes) -> str:
+    return os.path.join(config.INGEST_CACHE_PATH, key.hex() + _SUFFIX)
+
+
+def _get(key: bytes) -> Optional[list[Document]]:
+    path = _entry_path(key)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    # Refresh the modification time so eviction keeps recently reused entries
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass  # Evicted by another process after it was read
+    return [
+        Document(page_content=content, metadata=metadata)
+        for content, metadata in orjson.loads(zlib.decompress(data))
+    ]
+
+
+def _evict(max_bytes: int) -> None:
+    """Remove the least recently used entries until the cache fits max_bytes."""
+    entries = []
+    total = 0
+    with os.scandir(config.INGEST_CACHE_PATH) as it:
+        for entry in it:
+            if not entry.name.endswith(_SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue  # Evicted by another process meanwhile
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+    if total <= max_bytes:
+        return
+    entries.sort()
+    for _, size, path in entries:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        if total <= max_bytes:
+            break
+
+
+def _put(key: bytes, docs: list[Document]) -> None:
+    max_bytes = config.INGEST_CACHE_MAX_MB * 1024 * 1024
+    data = zlib.compress(
+        orjson.dumps([(doc.page_content, doc.metadata) for doc in docs])
+    )
+    if len(data) > max_bytes:
+        return
+
+    os.makedirs(config.INGEST_CACHE_PATH, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=config.INGEST_CACHE_PATH, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, _entry_path(key))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    _evict(max_bytes)
+
+
+def is_enabled() -> bool:
+    """Whether an ingest cache directory is configured."""
+    return bool(config.INGEST_CACHE_PATH) and config.INGEST_CACHE_MAX_MB > 0
+
+
+async def get_cached_documents(key: bytes) -> Optional[list[Document]]:
+    """Return the cached chunks for ``key``, or None on a miss or any error."""
+    try:
+        return await asyncio.to_thread(_get, key)
+    except Exception as e:
+        logger.warning("Failed to read ingest cache: %s", e)
+        return None
+
+
+async def cache_documents(key: bytes, docs: list[Document]) -> None:
+    """Store the chunks for ``key``; failures are logged and ignored.
+
+    Chunks whose metadata cannot be encoded as JSON are not cached.
+    """
+    try:
+        await asyncio.to_thread(_put, key, docs)
+    except Exception as e:
+        logger.warning("Failed to write ingest cache: %s", e)
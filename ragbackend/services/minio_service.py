@@ -1,6 +1,7 @@
+import asyncio
 import logging
 import io
-from typing import BinaryIO, Optional, Dict, Any
+from typing import BinaryIO, Iterator, Optional, Dict, Any
 from datetime import datetime, timedelta
 from urllib.parse import urljoin
 
@@ -18,9 +19,30 @@ from ragbackend.config import (
 
 logger = logging.getLogger(__name__)
 
+# Read size when streaming objects out; the HTTP response object otherwise
+# iterates line by line, which splits binary files into many tiny sends
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+
+def iter_object(response, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield the body of a ``download_file`` response in large chunks.
+
+    The connection is returned to the client's pool once the body is
+    consumed or the consumer stops early.
+    """
+    try:
+        yield from response.stream(chunk_size)
+    finally:
+        response.close()
+        response.release_conn()
+
 
 class MinIOService:
-    """MinIO service for handling file storage operations."""
+    """MinIO service for handling file storage operations.
+
+    The MinIO client is synchronous, so every call that talks to the server
+    runs in a worker thread to keep the event loop free.
+    """
     
     def __init__(self):
         """Initialize MinIO client."""
@@ -36,14 +58,14 @@ class MinIOService:
         """Initialize MinIO service and create bucket if it doesn't exist."""
         try:
             # Check if bucket exists, if not create it
-            if not self.client.bucket_exists(self.bucket_name):
-                self.client.make_bucket(self.bucket_name)
-                logger.info(f"Created MinIO bucket: {self.bucket_name}")
+            if not await asyncio.to_thread(self.client.bucket_exists, self.bucket_name):
+                await asyncio.to_thread(self.client.make_bucket, self.bucket_name)
+                logger.info("Created MinIO bucket: %s", self.bucket_name)
             else:
-                logger.info(f"MinIO bucket already exists: {self.bucket_name}")
+                logger.info("MinIO bucket already exists: %s", self.bucket_name)
             return True
         except S3Error as e:
-            logger.error(f"Failed to initialize MinIO service: {e}")
+            logger.error("Failed to initialize MinIO service: %s", e)
             return False
     
     def _generate_object_path(self, user_id: str, collection_id: str, file_id: str, filename: str) -> str:
@@ -75,22 +97,27 @@ class MinIOService:
             # Generate object path
             object_path = self._generate_object_path(user_id, collection_id, file_id, file.filename)
             
-            # Get file content
-            file_content = await file.read()
-            file_size = len(file_content)
-            
-            # Reset file pointer for potential reuse
+            # Stream the spooled upload instead of reading it into memory
             await file.seek(0)
+            file_size = file.size
+            if file_size is None:
+                file.file.seek(0, io.SEEK_END)
+                file_size = file.file.tell()
+                file.file.seek(0)
             
             # Upload to MinIO
-            result = self.client.put_object(
+            result = await asyncio.to_thread(
+                self.client.put_object,
                 self.bucket_name,
                 object_path,
-                io.BytesIO(file_content),
+                file.file,
                 file_size,
                 content_type=file.content_type or 'application/octet-stream'
             )
             
+            # Reset file pointer for potential reuse
+            await file.seek(0)
+            
             # Return file metadata
             metadata = {
                 'object_path': object_path,
@@ -105,14 +132,14 @@ class MinIOService:
                 'upload_time': datetime.utcnow().isoformat()
             }
             
-            logger.info(f"Successfully uploaded file: {object_path}")
+            logger.info("Successfully uploaded file: %s", object_path)
             return metadata
             
         except S3Error as e:
-            logger.error(f"Failed to upload file {file.filename}: {e}")
+            logger.error("Failed to upload file %s: %s", file.filename, e)
             raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
         except Exception as e:
-            logger.error(f"Unexpected error uploading file {file.filename}: {e}")
+            logger.error("Unexpected error uploading file %s: %s", file.filename, e)
             raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
     
     async def download_file(self, object_path: str) -> BinaryIO:
@@ -126,13 +153,15 @@ class MinIOService:
             Binary file stream
         """
         try:
-            response = self.client.get_object(self.bucket_name, object_path)
+            response = await asyncio.to_thread(
+                self.client.get_object, self.bucket_name, object_path
+            )
             return response
         except S3Error as e:
-            logger.error(f"Failed to download file {object_path}: {e}")
+            logger.error("Failed to download file %s: %s", object_path, e)
             raise HTTPException(status_code=404, detail=f"File not found: {object_path}")
         except Exception as e:
-            logger.error(f"Unexpected error downloading file {object_path}: {e}")
+            logger.error("Unexpected error downloading file %s: %s", object_path, e)
             raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
     
     async def delete_file(self, object_path: str) -> bool:
@@ -146,14 +175,16 @@ class MinIOService:
             True if successful, False otherwise
         """
         try:
-            self.client.remove_object(self.bucket_name, object_path)
-            logger.info(f"Successfully deleted file: {object_path}")
+            await asyncio.to_thread(
+                self.client.remove_object, self.bucket_name, object_path
+            )
+            logger.info("Successfully deleted file: %s", object_path)
             return True
         except S3Error as e:
-            logger.error(f"Failed to delete file {object_path}: {e}")
+            logger.error("Failed to delete file %s: %s", object_path, e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error deleting file {object_path}: {e}")
+            logger.error("Unexpected error deleting file %s: %s", object_path, e)
             return False
     
     async def delete_files_by_prefix(self, prefix: str) -> int:
@@ -167,30 +198,37 @@ class MinIOService:
             Number of files deleted
         """
         try:
-            objects = self.client.list_objects(self.bucket_name, prefix=prefix, recursive=True)
+            # The client's listings are lazy; drain them off the event loop
+            objects = await asyncio.to_thread(
+                list,
+                self.client.list_objects(self.bucket_name, prefix=prefix, recursive=True),
+            )
             object_names = [obj.object_name for obj in objects]
             
             if not object_names:
                 return 0
             
             # Use remove_objects for batch deletion
-            errors = self.client.remove_objects(
-                self.bucket_name,
-                [obj for obj in object_names]
+            errors = await asyncio.to_thread(
+                list,
+                self.client.remove_objects(
+                    self.bucket_name,
+                    [obj for obj in object_names]
+                ),
             )
             
             # Check for errors
             error_count = 0
             for error in errors:
-                logger.error(f"Failed to delete {error.object_name}: {error}")
+                logger.error("Failed to delete %s: %s", error.object_name, error)
                 error_count += 1
             
             success_count = len(object_names) - error_count
-            logger.info(f"Successfully deleted {success_count} files with prefix: {prefix}")
+            logger.info("Successfully deleted %s files with prefix: %s", success_count, prefix)
             
             return success_count
         except Exception as e:
-            logger.error(f"Unexpected error deleting files with prefix {prefix}: {e}")
+            logger.error("Unexpected error deleting files with prefix %s: %s", prefix, e)
             return 0
     
     async def get_file_info(self, object_path: str) -> Optional[Dict[str, Any]]:
@@ -204,7 +242,9 @@ class MinIOService:
             Dict containing file information or None if not found
         """
         try:
-            stat = self.client.stat_object(self.bucket_name, object_path)
+            stat = await asyncio.to_thread(
+                self.client.stat_object, self.bucket_name, object_path
+            )
             return {
                 'object_path': object_path,
                 'size': stat.size,
@@ -216,10 +256,10 @@ class MinIOService:
         except S3Error as e:
             if e.code == 'NoSuchKey':
                 return None
-            logger.error(f"Failed to get file info for {object_path}: {e}")
+            logger.error("Failed to get file info for %s: %s", object_path, e)
             return None
         except Exception as e:
-            logger.error(f"Unexpected error getting file info for {object_path}: {e}")
+            logger.error("Unexpected error getting file info for %s: %s", object_path, e)
             return None
     
     async def generate_presigned_url(
@@ -245,7 +285,7 @@ class MinIOService:
             )
             return url
         except S3Error as e:
-            logger.error(f"Failed to generate presigned URL for {object_path}: {e}")
+            logger.error("Failed to generate presigned URL for %s: %s", object_path, e)
             raise HTTPException(status_code=500, detail=f"Failed to generate download URL: {str(e)}")
     
     async def list_files_by_prefix(self, prefix: str) -> list[Dict[str, Any]]:
@@ -259,7 +299,10 @@ class MinIOService:
             List of file information dictionaries
         """
         try:
-            objects = self.client.list_objects(self.bucket_name, prefix=prefix, recursive=True)
+            objects = await asyncio.to_thread(
+                list,
+                self.client.list_objects(self.bucket_name, prefix=prefix, recursive=True),
+            )
             files = []
             
             for obj in objects:
@@ -273,7 +316,7 @@ class MinIOService:
             
             return files
         except Exception as e:
-            logger.error(f"Unexpected error listing files with prefix {prefix}: {e}")
+            logger.error("Unexpected error listing files with prefix %s: %s", prefix, e)
             return []
 
 
@@ -0,0 +1,106 @@
+"""In-memory cache of search results keyed by query embedding.
+
+A lookup is answered from the cache when a previously searched query's
+embedding is close enough to the new one (cosine similarity of at least
+``SEMANTIC_CACHE_THRESHOLD``), so near-duplicate queries skip the vector
+search. Cached embeddings are kept as rows of one normalized float32 matrix,
+which makes a lookup a single matrix-vector product. The cache is enabled by
+a non-zero ``SEMANTIC_CACHE_SIZE``.
+"""
+
+import time
+from collections.abc import Sequence
+from typing import Any, Optional
+
+import numpy as np
+
+from ragbackend import config
+
+
+def _normalize(embedding: Sequence[float]) -> Optional[np.ndarray]:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    if not norm:
+        return None
+    return vector / norm
+
+
+class SemanticCache:
+    """Fixed-size nearest-neighbour cache of search results.
+
+    Each entry holds the results of a search for ``k`` hits and answers later
+    searches for up to ``k`` hits. Entries expire ``ttl`` seconds after being
+    stored; when the cache is full the least recently used entry is replaced.
+    """
+
+    def __init__(self, capacity: int, threshold: float, ttl: float):
+        self.capacity = capacity
+        self.threshold = threshold
+        self.ttl = ttl
+        # Allocated on the first insert, once the embedding size is known
+        self._vectors: Optional[np.ndarray] = None
+        self._values: list[Any] = [None] * capacity
+        self._k = np.zeros(capacity, dtype=np.int64)
+        # 0 marks an empty slot
+        self._expires_at = np.zeros(capacity, dtype=np.float64)
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._clock = 0
+
+    def get(self, embedding: Sequence[float], k: int) -> Optional[list[Any]]:
+        """Return the first ``k`` cached results for a similar query, or None."""
+        if self._vectors is None or len(embedding) != self._vectors.shape[1]:
+            return None
+        query = _normalize(embedding)
+        if query is None:
+            return None
+
+        similarities = self._vectors @ query
+        usable = (self._expires_at > time.monotonic()) & (self._k >= k)
+        similarities[~usable] = -np.inf
+        slot = int(np.argmax(similarities))
+        if similarities[slot] < self.threshold:
+            return None
+
+        self._clock += 1
+        self._last_used[slot] = self._clock
+        return self._values[slot][:k]
+
+    def put(self, embedding: Sequence[float], k: int, value: list[Any]) -> None:
+        """Store the results of a search for ``k`` hits."""
+        query = _normalize(embedding)
+        if query is None:
+            return
+        if self._vectors is None:
+            self._vectors = np.zeros((self.capacity, len(query)), dtype=np.float32)
+        elif len(query) != self._vectors.shape[1]:
+            return
+
+        # Reuse an empty or expired slot before evicting a live entry
+        stale = np.flatnonzero(self._expires_at <= time.monotonic())
+        slot = int(stale[0]) if len(stale) else int(np.argmin(self._last_used))
+
+        self._clock += 1
+        self._vectors[slot] = query
+        self._values[slot] = value
+        self._k[slot] = k
+        self._expires_at[slot] = time.monotonic() + self.ttl
+        self._last_used[slot] = self._clock
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._values = [None] * self.capacity
+        self._expires_at[:] = 0
+
+
+def is_enabled() -> bool:
+    """Whether the semantic search cache is configured."""
+    return config.SEMANTIC_CACHE_SIZE > 0 and config.SEMANTIC_CACHE_TTL > 0
+
+
+def new_cache() -> SemanticCache:
+    """Create a cache with the configured size, threshold and TTL."""
+    return SemanticCache(
+        capacity=config.SEMANTIC_CACHE_SIZE,
+        threshold=config.SEMANTIC_CACHE_THRESHOLD,
+        ttl=config.SEMANTIC_CACHE_TTL,
+    )
@@ -1,5 +1,6 @@
 import asyncio
 import os
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, patch, MagicMock
 
 import pytest
@@ -48,8 +49,39 @@ def mock_all_db_operations():
         p.stop()
 
 
+@pytest.fixture
+def db_conn():
+    """Patch the collections module's get_db_connection with one mock connection.
+
+    ``checkouts`` on the connection counts how often it was acquired.
+    """
+    conn = AsyncMock()
+    conn.transaction = MagicMock()
+    conn.checkouts = 0
+
+    @asynccontextmanager
+    async def fake_connection():
+        conn.checkouts += 1
+        yield conn
+
+    with patch(
+        "ragbackend.database.collections.get_db_connection", fake_connection
+    ):
+        yield conn
+
+
 @pytest.fixture(autouse=True)
 def mock_auth_in_testing():
     """Ensure auth works properly in testing mode."""
     with patch("ragbackend.config.IS_TESTING", True):
         yield
+
+
+@pytest.fixture(autouse=True)
+def clear_auth_cache():
+    """Keep token-to-user resolutions from leaking between tests."""
+    from ragbackend.auth import clear_user_cache
+
+    clear_user_cache()
+    yield
+    clear_user_cache()
@@ -1,15 +1,20 @@
 """Authentication tests."""
 
+import asyncio
+
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, patch
 from fastapi import HTTPException
 
+import bcrypt
+
 from ragbackend.services.jwt_service import (
     create_access_token,
     verify_token,
     verify_password,
     get_password_hash,
+    password_needs_rehash,
 )
 from ragbackend.auth import get_current_user, resolve_user, AuthenticatedUser
 from ragbackend import config
@@ -38,6 +43,19 @@ class TestJWTService:
         assert hashed != password
         assert len(hashed) > 20  # bcrypt hashes are typically 60 characters
 
+    def test_legacy_bcrypt_hash(self):
+        """Test bcrypt hashes from before Argon2id still verify and need rehashing."""
+        hashed = bcrypt.hashpw(b"test_password", bcrypt.gensalt(rounds=4)).decode()
+        assert verify_password("test_password", hashed) is True
+        assert verify_password("wrong_password", hashed) is False
+        assert password_needs_rehash(hashed) is True
+
+    def test_argon2_hash_does_not_need_rehash(self):
+        """Test fresh hashes are Argon2id with current parameters."""
+        hashed = get_password_hash("test_password")
+        assert hashed.startswith("$argon2id$")
+        assert password_needs_rehash(hashed) is False
+
     def test_create_access_token_default_expiry(self):
         """Test creating access token with default expiry."""
         data = {"sub": "user123", "username": "testuser"}
@@ -149,6 +167,52 @@ class TestAuthFunctions:
             assert user == mock_user
             mock_get_user.assert_called_once_with("user123")
 
+    @pytest.mark.asyncio
+    async def test_get_current_user_is_cached(self):
+        """Test a token's user is looked up once and then served from memory."""
+        mock_user = {"id": "user123", "username": "testuser", "is_active": True}
+
+        with patch("ragbackend.auth.get_user_by_id", new_callable=AsyncMock) as mock_get_user:
+            mock_get_user.return_value = mock_user
+            token = create_access_token({"sub": "user123", "username": "testuser"})
+
+            assert await get_current_user(token) == mock_user
+            assert await get_current_user(token) == mock_user
+            mock_get_user.assert_called_once_with("user123")
+
+    @pytest.mark.asyncio
+    async def test_get_current_user_coalesces_concurrent_lookups(self):
+        """Test concurrent requests for one user share a single query."""
+        mock_user = {"id": "user123", "username": "testuser", "is_active": True}
+
+        async def slow_get_user(user_id):
+            await asyncio.sleep(0.01)
+            return mock_user
+
+        with patch("ragbackend.auth.get_user_by_id", new_callable=AsyncMock) as mock_get_user, \
+             patch("ragbackend.config.AUTH_CACHE_TTL", 0):
+            mock_get_user.side_effect = slow_get_user
+            token = create_access_token({"sub": "user123", "username": "testuser"})
+
+            users = await asyncio.gather(*(get_current_user(token) for _ in range(5)))
+
+            assert users == [mock_user] * 5
+            mock_get_user.assert_called_once_with("user123")
+
+    @pytest.mark.asyncio
+    async def test_get_current_user_cache_disabled(self):
+        """Test AUTH_CACHE_TTL=0 looks the user up on every call."""
+        mock_user = {"id": "user123", "username": "testuser", "is_active": True}
+
+        with patch("ragbackend.auth.get_user_by_id", new_callable=AsyncMock) as mock_get_user, \
+             patch("ragbackend.config.AUTH_CACHE_TTL", 0):
+            mock_get_user.return_value = mock_user
+            token = create_access_token({"sub": "user123", "username": "testuser"})
+
+            await get_current_user(token)
+            await get_current_user(token)
+            assert mock_get_user.call_count == 2
+
     @pytest.mark.asyncio
     async def test_get_current_user_invalid_token(self):
         """Test getting current user with invalid token."""
@@ -158,6 +222,16 @@ class TestAuthFunctions:
         assert exc_info.value.status_code == 401
         assert exc_info.value.detail == "Invalid token"
 
+    @pytest.mark.asyncio
+    async def test_get_current_user_malformed_token_skips_decode(self):
+        """Test tokens that aren't three dot-separated segments are never decoded."""
+        with patch("ragbackend.auth.verify_token") as mock_verify:
+            with pytest.raises(HTTPException) as exc_info:
+                await get_current_user("a.b")
+
+        assert exc_info.value.status_code == 401
+        mock_verify.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_get_current_user_missing_sub(self):
         """Test getting current user with token missing sub claim."""
@@ -0,0 +1,600 @@
+"""Collection tests."""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import orjson
+import pytest
+from fastapi import HTTPException
+from langchain_core.documents import Document
+
+from ragbackend.api.responses import OrjsonResponse
+from ragbackend.database.collections import (
+    HNSW_EF_SEARCH_MAX,
+    Collection,
+    CollectionsManager,
+    _embed_documents,
+    _embed_query_batched,
+    _hnsw_ef_search,
+    clear_collection_details_cache,
+    clear_search_caches,
+    evict_collection_details,
+)
+
+DETAILS = {
+    "uuid": "c1",
+    "name": "docs",
+    "table_id": "collection_c1",
+    "metadata": {},
+    "embedding_model": "default",
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_details_cache():
+    """Keep cached collection details and search results from leaking between tests."""
+    clear_collection_details_cache()
+    clear_search_caches()
+    yield
+    clear_collection_details_cache()
+    clear_search_caches()
+
+
+class TestCollectionDetailsCache:
+    """Test collection details are cached and coalesced."""
+
+    @pytest.mark.asyncio
+    async def test_get_collection_is_cached(self):
+        """Test a collection's row is fetched once and then served from memory."""
+        with patch(
+            "ragbackend.database.collections._fetch_details", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.return_value = DETAILS
+            manager = CollectionsManager("user1")
+
+            first = await manager.get_collection("c1")
+            second = await manager.get_collection("c1")
+
+            assert first.details == second.details == DETAILS
+            mock_fetch.assert_called_once_with("c1")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_query(self):
+        """Test concurrent lookups of an uncached collection share a query."""
+
+        async def slow_fetch(collection_uuid):
+            await asyncio.sleep(0.01)
+            return DETAILS
+
+        with patch(
+            "ragbackend.database.collections._fetch_details", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.side_effect = slow_fetch
+            manager = CollectionsManager("user1")
+
+            await asyncio.gather(*(manager.get_collection("c1") for _ in range(5)))
+
+            mock_fetch.assert_called_once_with("c1")
+
+    @pytest.mark.asyncio
+    async def test_evicted_details_are_refetched(self):
+        """Test evicting a collection forces the next lookup to the database."""
+        with patch(
+            "ragbackend.database.collections._fetch_details", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.return_value = DETAILS
+            manager = CollectionsManager("user1")
+
+            await manager.get_collection("c1")
+            evict_collection_details("c1")
+            await manager.get_collection("c1")
+
+            assert mock_fetch.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_collection_is_not_cached(self):
+        """Test a missing collection raises 404 every time."""
+        with patch(
+            "ragbackend.database.collections._fetch_details", new_callable=AsyncMock
+        ) as mock_fetch:
+            mock_fetch.return_value = None
+            manager = CollectionsManager("user1")
+
+            for _ in range(2):
+                with pytest.raises(HTTPException) as exc_info:
+                    await manager.get_collection("missing")
+                assert exc_info.value.status_code == 404
+
+            assert mock_fetch.call_count == 2
+
+
+class RecordingEmbeddings:
+    """Embeds each text as its index and records the batches it was sent."""
+
+    def __init__(self):
+        self.batches = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def aembed_documents(self, texts):
+        self.batches.append(texts)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return [[float(text)] for text in texts]
+
+    async def aembed_query(self, text):
+        return (await self.aembed_documents([text]))[0]
+
+
+class TestEmbedDocuments:
+    """Test batched, concurrent embedding of chunks."""
+
+    @pytest.mark.asyncio
+    async def test_batches_keep_input_order(self):
+        """Test vectors come back in input order across concurrent batches."""
+        embeddings = RecordingEmbeddings()
+        texts = [str(i) for i in range(10)]
+
+        with patch("ragbackend.config.EMBED_MAX_CONCURRENT_BATCHES", 2):
+            vectors = await _embed_documents(embeddings, texts, batch_size=3)
+
+        assert vectors == [[float(i)] for i in range(10)]
+        assert [len(batch) for batch in embeddings.batches] == [3, 3, 3, 1]
+        assert embeddings.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_small_input_is_one_request(self):
+        """Test inputs within one batch are embedded with a single request."""
+        embeddings = RecordingEmbeddings()
+
+        await _embed_documents(embeddings, ["0", "1"], batch_size=3)
+
+        assert embeddings.batches == [["0", "1"]]
+
+
+class TestEmbedQueryBatched:
+    """Test micro-batching of search query embeddings."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_share_one_request(self):
+        """Test queries arriving within the window are embedded together."""
+        embeddings = RecordingEmbeddings()
+
+        with patch("ragbackend.config.SEARCH_BATCH_WINDOW_MS", 5):
+            vectors = await asyncio.gather(
+                *(_embed_query_batched(embeddings, str(i)) for i in range(3))
+            )
+
+        assert vectors == [[0.0], [1.0], [2.0]]
+        assert embeddings.batches == [["0", "1", "2"]]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_starts_a_new_one(self):
+        """Test a batch stops taking queries at EMBED_BATCH_SIZE."""
+        embeddings = RecordingEmbeddings()
+
+        with patch("ragbackend.config.SEARCH_BATCH_WINDOW_MS", 5), patch(
+            "ragbackend.config.EMBED_BATCH_SIZE", 2
+        ):
+            vectors = await asyncio.gather(
+                *(_embed_query_batched(embeddings, str(i)) for i in range(3))
+            )
+
+        assert vectors == [[0.0], [1.0], [2.0]]
+        assert sorted(embeddings.batches) == [["0", "1"], ["2"]]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_is_sent_without_waiting(self):
+        """Test a full batch is embedded at once rather than after the window."""
+        embeddings = RecordingEmbeddings()
+
+        with patch("ragbackend.config.SEARCH_BATCH_WINDOW_MS", 60_000), patch(
+            "ragbackend.config.EMBED_BATCH_SIZE", 2
+        ):
+            vectors = await asyncio.wait_for(
+                asyncio.gather(
+                    *(_embed_query_batched(embeddings, str(i)) for i in range(2))
+                ),
+                timeout=1,
+            )
+
+        assert vectors == [[0.0], [1.0]]
+        assert embeddings.batches == [["0", "1"]]
+
+    @pytest.mark.asyncio
+    async def test_short_response_does_not_hang(self):
+        """Test queries still resolve when the provider returns too few vectors."""
+        embeddings = RecordingEmbeddings()
+        embed_batch = embeddings.aembed_documents
+
+        async def drop_last(texts):
+            return (await embed_batch(texts))[: max(len(texts) - 1, 1)]
+
+        embeddings.aembed_documents = drop_last
+        with patch("ragbackend.config.SEARCH_BATCH_WINDOW_MS", 5):
+            vectors = await asyncio.wait_for(
+                asyncio.gather(
+                    *(_embed_query_batched(embeddings, str(i)) for i in range(3))
+                ),
+                timeout=1,
+            )
+
+        assert vectors == [[0.0], [1.0], [2.0]]
+
+    @pytest.mark.asyncio
+    async def test_failing_query_only_fails_itself(self):
+        """Test a query the provider rejects does not fail its batch mates."""
+        embeddings = RecordingEmbeddings()
+        embed_batch = embeddings.aembed_documents
+
+        async def reject_bad(texts):
+            if "bad" in texts:
+                raise ValueError("too many tokens")
+            return await embed_batch(texts)
+
+        embeddings.aembed_documents = reject_bad
+        with patch("ragbackend.config.SEARCH_BATCH_WINDOW_MS", 5):
+            results = await asyncio.gather(
+                _embed_query_batched(embeddings, "0"),
+                _embed_query_batched(embeddings, "bad"),
+                _embed_query_batched(embeddings, "2"),
+                return_exceptions=True,
+            )
+
+        assert results[0] == [0.0]
+        assert isinstance(results[1], ValueError)
+        assert results[2] == [2.0]
+
+    @pytest.mark.asyncio
+    async def test_zero_window_embeds_each_query(self):
+        """Test SEARCH_BATCH_WINDOW_MS=0 sends every query on its own."""
+        embeddings = RecordingEmbeddings()
+
+        with patch("ragbackend.config.SEARCH_BATCH_WINDOW_MS", 0):
+            await asyncio.gather(
+                *(_embed_query_batched(embeddings, str(i)) for i in range(2))
+            )
+
+        assert sorted(embeddings.batches) == [["0"], ["1"]]
+
+
+class TestDeleteCollection:
+    """Test collection teardown."""
+
+    @pytest.mark.asyncio
+    async def test_failed_cleanup_branch_does_not_stop_deletion(self, db_conn):
+        """Test the other cleanup steps run even if MinIO cleanup fails."""
+        db_conn.fetchrow.return_value = {"table_id": "collection_c1"}
+
+        minio = AsyncMock()
+        minio.delete_files_by_prefix.side_effect = RuntimeError("minio down")
+
+        with patch(
+            "ragbackend.services.minio_service.get_minio_service",
+            return_value=minio,
+        ), patch(
+            "ragbackend.database.files.delete_files_by_collection",
+            new_callable=AsyncMock,
+        ) as mock_delete_files:
+            deleted = await CollectionsManager("user1").delete_collection(
+                "c1", "user1"
+            )
+
+        assert deleted is True
+        minio.delete_files_by_prefix.assert_awaited_once_with("user1/c1/")
+        mock_delete_files.assert_awaited_once_with("c1", "user1")
+        assert db_conn.fetchrow.await_args.args == (
+            "DELETE FROM collections WHERE uuid = $1 RETURNING table_id",
+            "c1",
+        )
+        db_conn.execute.assert_awaited_once_with(
+            'DROP TABLE IF EXISTS "collection_c1"'
+        )
+
+    @pytest.mark.asyncio
+    async def test_missing_collection_is_not_cleaned_up(self, db_conn):
+        """Test nothing else is touched when the collection doesn't exist."""
+        db_conn.fetchrow.return_value = None
+
+        with patch(
+            "ragbackend.services.minio_service.get_minio_service"
+        ) as get_minio_service:
+            deleted = await CollectionsManager("user1").delete_collection(
+                "c1", "user1"
+            )
+
+        assert deleted is False
+        get_minio_service.assert_not_called()
+        db_conn.execute.assert_not_awaited()
+
+
+class TestCreateCollection:
+    """Test collection creation."""
+
+    @pytest.mark.asyncio
+    async def test_setup_runs_in_one_transaction(self, db_conn):
+        """Test the indexes and the metadata row share one connection and transaction."""
+        db_conn.fetchval.return_value = "0.8.0"
+
+        store = AsyncMock()
+        with patch(
+            "ragbackend.database.collections.get_vectorstore",
+            new_callable=AsyncMock,
+            return_value=store,
+        ):
+            details = await CollectionsManager("user1").create_collection("docs")
+
+        assert db_conn.checkouts == 1
+        db_conn.transaction.assert_called_once()
+        statements = [call.args[0] for call in db_conn.execute.await_args_list]
+        assert "halfvec" in statements[0]
+        assert "INSERT INTO collections" in statements[-1]
+        assert details["name"] == "docs"
+        store.aapply_vector_index.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_wide_vectors_keep_full_precision(self, db_conn):
+        """Test tables are sized from embedding_dimensions and too-wide ones skip halfvec."""
+        db_conn.fetchval.return_value = "0.8.0"
+
+        store = AsyncMock()
+        with patch(
+            "ragbackend.database.collections.get_vectorstore",
+            new_callable=AsyncMock,
+            return_value=store,
+        ) as mock_get_vectorstore:
+            await CollectionsManager("user1").create_collection(
+                "docs", embedding_dimensions=4096
+            )
+
+        assert mock_get_vectorstore.await_args.kwargs["vector_size"] == 4096
+        statements = [call.args[0] for call in db_conn.execute.await_args_list]
+        assert not any("halfvec" in statement for statement in statements)
+        store.aapply_vector_index.assert_awaited_once()
+
+
+class TestListCollections:
+    """Test collection listings."""
+
+    @pytest.mark.asyncio
+    async def test_summary_skips_metadata(self, db_conn):
+        """Test summary listings don't select the metadata column and page in SQL."""
+        db_conn.fetch.return_value = []
+
+        await CollectionsManager("user1").list_collections(
+            limit=20, offset=40, summary=True
+        )
+
+        sql, limit, offset = db_conn.fetch.await_args.args
+        assert "NULL::jsonb AS metadata" in sql
+        assert (limit, offset) == (20, 40)
+
+
+class TestUpdateCollection:
+    """Test collection updates."""
+
+    @pytest.mark.asyncio
+    async def test_missing_collection_is_404(self, db_conn):
+        """Test updating a missing collection raises 404 after one query."""
+        db_conn.fetchrow.return_value = None
+
+        with pytest.raises(HTTPException) as exc_info:
+            await CollectionsManager("user1").update_collection("c1", name="new")
+
+        assert exc_info.value.status_code == 404
+        db_conn.fetchrow.assert_awaited_once()
+
+
+class TestList:
+    """Test file listings."""
+
+    @pytest.mark.asyncio
+    async def test_timestamps_render_like_isoformat(self):
+        """Test listed timestamps stay datetimes and orjson renders them as isoformat would."""
+        created = datetime(2024, 5, 1, 12, 30, 15, 123456)
+        files = [
+            {
+                "file_id": "f1",
+                "filename": "a.txt",
+                "file_size": 3,
+                "content_type": "text/plain",
+                "upload_time": created,
+                "object_path": "user1/c1/a.txt",
+                "created_at": created,
+                "updated_at": None,
+            }
+        ]
+        collection = Collection("c1", "user1", details=DETAILS)
+        with patch(
+            "ragbackend.database.files.get_files_by_collection",
+            new_callable=AsyncMock,
+            return_value=files,
+        ):
+            rows = await collection.list()
+
+        assert rows[0]["created_at"] is created
+        body = orjson.loads(OrjsonResponse(rows).body)
+        assert body[0]["created_at"] == created.isoformat()
+        assert body[0]["metadata"]["upload_time"] == created.isoformat()
+        assert body[0]["updated_at"] is None
+
+
+class TestSearch:
+    """Test search results."""
+
+    @pytest.mark.asyncio
+    async def test_hits_are_built_from_rows(self):
+        """Test search turns result rows straight into scored hits."""
+        collection = Collection("c1", "user1", details=DETAILS)
+        rows = [
+            {
+                "langchain_id": "d1",
+                "content": "hello",
+                "langchain_metadata": {"file_id": "f1"},
+                "distance": 0.25,
+            },
+            {
+                "langchain_id": "d2",
+                "content": "world",
+                "langchain_metadata": None,
+                "distance": 0.5,
+            },
+        ]
+        with patch.object(
+            collection, "_embed_query", AsyncMock(return_value=[0.1])
+        ), patch.object(
+            collection, "_search_rows", AsyncMock(return_value=rows)
+        ) as mock_rows:
+            hits = await collection.search("query", limit=2)
+
+        mock_rows.assert_awaited_once_with([0.1], 2)
+        assert hits == [
+            {"id": "d1", "content": "hello", "metadata": {"file_id": "f1"}, "score": 0.25},
+            {"id": "d2", "content": "world", "metadata": {}, "score": 0.5},
+        ]
+
+    def test_ef_search_stays_within_pgvector_range(self):
+        """Test ef_search scales with k but never exceeds what pgvector accepts."""
+        assert _hnsw_ef_search(1) == 40
+        assert _hnsw_ef_search(10) == 200
+        assert _hnsw_ef_search(50) == HNSW_EF_SEARCH_MAX
+        assert _hnsw_ef_search(51) == HNSW_EF_SEARCH_MAX
+        assert _hnsw_ef_search(1000) == HNSW_EF_SEARCH_MAX
+
+    @pytest.mark.asyncio
+    async def test_large_k_sets_valid_ef_search(self, db_conn):
+        """Test a search for more than 50 hits sets an ef_search pgvector accepts."""
+        collection = Collection("c1", "user1", details=DETAILS)
+        db_conn.fetch.return_value = []
+
+        await collection._search_rows([0.1], 200)
+
+        statement = db_conn.execute.await_args.args[0]
+        assert f"hnsw.ef_search = {HNSW_EF_SEARCH_MAX};" in statement
+        assert db_conn.fetch.await_args.args[-1] == 200
+
+    @pytest.mark.asyncio
+    async def test_similarity_search_many_embeds_once(self):
+        """Test a batch of queries is embedded in one request, results in order."""
+        collection = Collection("c1", "user1", details=DETAILS)
+        embeddings = RecordingEmbeddings()
+
+        async def search_by_vector(embedding, k):
+            return [(Document(page_content=str(embedding[0])), 0.0)]
+
+        with patch(
+            "ragbackend.config.get_default_embeddings", return_value=embeddings
+        ), patch.object(collection, "_search_by_vector", side_effect=search_by_vector):
+            results = await collection.similarity_search_many(["0", "1", "2"], k=1)
+
+        assert embeddings.batches == [["0", "1", "2"]]
+        assert [[doc.page_content for doc in docs] for docs in results] == [
+            ["0.0"],
+            ["1.0"],
+            ["2.0"],
+        ]
+
+
+class TestUpdateDocuments:
+    """Test batched document updates."""
+
+    @pytest.mark.asyncio
+    async def test_updates_are_one_statement(self, db_conn):
+        """Test all updates are bound as arrays of one statement."""
+        db_conn.fetch.return_value = [{"langchain_id": "d1"}]
+
+        collection = Collection("c1", "user1", details=DETAILS)
+        updated = await collection.update_documents(
+            [
+                ("d1", {"page_content": "new"}),
+                ("d2", {"metadata": {"tag": "x"}}),
+            ]
+        )
+
+        assert updated == ["d1"]
+        db_conn.fetch.assert_awaited_once()
+        _, ids, contents, metadata = db_conn.fetch.await_args.args
+        assert ids == ["d1", "d2"]
+        assert contents == ["new", None]
+        assert metadata == [None, {"tag": "x"}]
+
+
+class TestIterDocuments:
+    """Test streaming chunks through a cursor."""
+
+    @pytest.mark.asyncio
+    async def test_rows_stream_in_large_batches(self, db_conn):
+        """Test chunks are built from cursor rows fetched in large batches."""
+        rows = [("d1", "hello", {"file_id": "f1"}), ("d2", "world", None)]
+
+        async def cursor_rows():
+            for row in rows:
+                yield row
+
+        db_conn.cursor = MagicMock(return_value=cursor_rows())
+
+        collection = Collection("c1", "user1", details=DETAILS)
+        chunks = [chunk async for chunk in collection.iter_document_dicts()]
+
+        assert chunks == [
+            {"id": "d1", "content": "hello", "metadata": {"file_id": "f1", "custom_id": "d1"}},
+            {"id": "d2", "content": "world", "metadata": {"custom_id": "d2"}},
+        ]
+        assert db_conn.cursor.call_args.kwargs["prefetch"] == 1000
+
+
+class TestSearchCache:
+    """Test the semantic cache in front of vector searches."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_search_skips_database_until_write(self, db_conn):
+        """Test a repeated query is served from the cache until the collection changes."""
+        rows = [{"langchain_id": "d1", "content": "x", "langchain_metadata": {}, "distance": 0.1}]
+        db_conn.fetch.return_value = rows
+
+        collection = Collection("c1", "user1", details=DETAILS)
+        assert await collection._search_rows([1.0, 0.0], 1) == rows
+        assert await collection._search_rows([1.0, 0.001], 1) == rows
+        assert db_conn.fetch.await_count == 1
+
+        await collection.delete_documents(["d1"])
+        await collection._search_rows([1.0, 0.0], 1)
+        assert db_conn.fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_hits_do_not_share_metadata(self, db_conn):
+        """Test mutating a hit's metadata does not change later cache hits."""
+        rows = [
+            {
+                "langchain_id": "d1",
+                "content": "x",
+                "langchain_metadata": {"tags": ["a"]},
+                "distance": 0.1,
+            }
+        ]
+        db_conn.fetch.return_value = rows
+
+        collection = Collection("c1", "user1", details=DETAILS)
+        hits = await collection._search_rows([1.0, 0.0], 1)
+        hits[0]["langchain_metadata"]["tags"].append("b")
+        cached = await collection._search_rows([1.0, 0.0], 1)
+        cached[0]["langchain_metadata"]["tags"].append("c")
+        again = await collection._search_rows([1.0, 0.0], 1)
+
+        assert db_conn.fetch.await_count == 1
+        assert again[0]["langchain_metadata"] == {"tags": ["a"]}
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_always_queries(self, db_conn):
+        """Test SEMANTIC_CACHE_SIZE=0 sends every search to the database."""
+        db_conn.fetch.return_value = []
+
+        collection = Collection("c1", "user1", details=DETAILS)
+        with patch("ragbackend.config.SEMANTIC_CACHE_SIZE", 0):
+            await collection._search_rows([1.0, 0.0], 1)
+            await collection._search_rows([1.0, 0.0], 1)
+
+        assert db_conn.fetch.await_count == 2
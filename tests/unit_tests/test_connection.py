@@ -0,0 +1,209 @@
+"""Database connection tests."""
+
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from ragbackend.database import connection
+from ragbackend.database.connection import get_db_connection, get_vectorstore
+
+
+class FakePool:
+    """Minimal stand-in for asyncpg.Pool that tracks checked out connections."""
+
+    def __init__(self):
+        self.conn = AsyncMock()
+        self.acquired = 0
+        self.released = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        self.acquired += 1
+        try:
+            yield self.conn
+        finally:
+            self.released += 1
+
+
+class TestGetDbConnection:
+    """Test get_db_connection."""
+
+    @pytest.mark.asyncio
+    async def test_connection_returned_to_pool(self):
+        """Pooled connections are released, never closed."""
+        pool = FakePool()
+        with patch(
+            "ragbackend.database.connection.get_db_pool",
+            new_callable=AsyncMock,
+            return_value=pool,
+        ):
+            for _ in range(1000):
+                async with get_db_connection() as conn:
+                    assert conn is pool.conn
+
+        assert pool.acquired == pool.released == 1000
+        pool.conn.close.assert_not_awaited()
+
+
+class TestGetDbPool:
+    """Test get_db_pool."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_calls_create_one_pool(self):
+        """Callers racing on an uncreated pool share a single pool."""
+        pool = FakePool()
+
+        async def slow_create_pool(**kwargs):
+            await asyncio.sleep(0.01)
+            return pool
+
+        with patch.object(connection, "_pool", None), patch.object(
+            connection.asyncpg, "create_pool", side_effect=slow_create_pool
+        ) as mock_create_pool:
+            pools = await asyncio.gather(
+                *(connection.get_db_pool() for _ in range(5))
+            )
+
+        assert pools == [pool] * 5
+        mock_create_pool.assert_called_once()
+
+
+class TestGetVectorstore:
+    """Test get_vectorstore caching."""
+
+    @pytest.mark.asyncio
+    async def test_store_is_cached_until_evicted(self):
+        """A store is built once per collection and rebuilt after eviction."""
+        engine = AsyncMock()
+        embeddings = object()
+        with patch.object(
+            connection.PGVectorStore, "create", new_callable=AsyncMock
+        ) as mock_create:
+            mock_create.side_effect = lambda **kwargs: object()
+            first = await get_vectorstore(
+                "cached_table", embeddings=embeddings, engine=engine
+            )
+            second = await get_vectorstore(
+                "cached_table", embeddings=embeddings, engine=engine
+            )
+            assert first is second
+            assert mock_create.await_count == 1
+
+            connection.evict_vectorstore("cached_table")
+            third = await get_vectorstore(
+                "cached_table", embeddings=embeddings, engine=engine
+            )
+            assert third is not first
+            assert mock_create.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_build(self):
+        """Concurrent requests for an uncached store build it once."""
+        engine = AsyncMock()
+        embeddings = object()
+
+        async def slow_create(**kwargs):
+            await asyncio.sleep(0.01)
+            return object()
+
+        with patch.object(
+            connection.PGVectorStore, "create", new_callable=AsyncMock
+        ) as mock_create:
+            mock_create.side_effect = slow_create
+            stores = await asyncio.gather(
+                *(
+                    get_vectorstore(
+                        "coalesced_table", embeddings=embeddings, engine=engine
+                    )
+                    for _ in range(5)
+                )
+            )
+            connection.evict_vectorstore("coalesced_table")
+
+        assert all(store is stores[0] for store in stores)
+        assert mock_create.await_count == 1
+        engine.ainit_vectorstore_table.assert_awaited_once()
+
+
+class TestGetVectorstoreEngine:
+    """Test the PGVectorStore engine."""
+
+    def test_pool_is_sized_separately(self):
+        """The engine pool uses its own budget, not the asyncpg pool's."""
+        connection.get_vectorstore_engine.cache_clear()
+        try:
+            with patch.object(
+                connection.PGEngine, "from_connection_string"
+            ) as mock_engine, patch(
+                "ragbackend.config.VECTORSTORE_POOL_MIN", 2
+            ), patch("ragbackend.config.VECTORSTORE_POOL_MAX", 10):
+                connection.get_vectorstore_engine()
+        finally:
+            connection.get_vectorstore_engine.cache_clear()
+
+        kwargs = mock_engine.call_args.kwargs
+        assert kwargs["pool_size"] == 2
+        assert kwargs["pool_size"] + kwargs["max_overflow"] == 10
+
+
+class TestVectorCodecs:
+    """Test the pgvector binary codecs."""
+
+    def test_vector_round_trip(self):
+        """vector values are packed as big-endian float32 after the header."""
+        data = connection._encode_vector([0.5, -1.25, 3.0])
+        assert data[:4] == b"\x00\x03\x00\x00"
+        assert connection._decode_vector(data) == [0.5, -1.25, 3.0]
+
+    def test_halfvec_round_trip(self):
+        """halfvec values are packed as big-endian float16 after the header."""
+        data = connection._encode_halfvec([0.5, -1.25, 3.0])
+        assert len(data) == 4 + 3 * 2
+        assert connection._decode_halfvec(data) == [0.5, -1.25, 3.0]
+
+
+class TestUuidCodec:
+    """Test the binary uuid codec."""
+
+    def test_round_trip_as_str(self):
+        """uuids are sent as 16 bytes and decoded to canonical strings."""
+        value = "12345678-1234-5678-1234-567812345678"
+        data = connection._encode_uuid(value)
+        assert data == uuid.UUID(value).bytes
+        assert connection._decode_uuid(data) == value
+
+    def test_uuid_objects_are_accepted(self):
+        """Parameters may also be uuid.UUID instances."""
+        value = uuid.uuid4()
+        assert connection._decode_uuid(connection._encode_uuid(value)) == str(value)
+
+    def test_invalid_uuid_is_rejected(self):
+        """Malformed ids fail before reaching the server."""
+        with pytest.raises(ValueError):
+            connection._encode_uuid("not-a-uuid")
+
+
+class TestJsonCodecs:
+    """Test the binary json and jsonb codecs."""
+
+    def test_json_round_trip(self):
+        """json values are the document text."""
+        data = connection._encode_json({"a": [1, "b"]})
+        assert connection._decode_json(data) == {"a": [1, "b"]}
+
+    def test_jsonb_round_trip(self):
+        """jsonb values carry a version byte before the document text."""
+        data = connection._encode_jsonb({"a": 1})
+        assert data[:1] == b"\x01"
+        assert connection._decode_jsonb(data) == {"a": 1}
+
+    def test_non_string_keys_are_stringified(self):
+        """Integer keys are written as strings, as json.dumps would."""
+        assert connection._encode_json({1: "a"}) == b'{"1":"a"}'
+
+    def test_serialized_strings_pass_through(self):
+        """Already-serialized JSON is sent as is."""
+        assert connection._encode_json('{"a": 1}') == b'{"a": 1}'
@@ -0,0 +1,104 @@
+"""Document processor tests."""
+
+import asyncio
+import io
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.documents.base import Blob
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from starlette.datastructures import Headers, UploadFile
+
+from ragbackend.services import document_processor
+from ragbackend.services.document_processor import (
+    LiteralTextSplitter,
+    process_document,
+)
+
+SAMPLE_TEXT = (
+    "Title\n\nFirst paragraph with a few words in it.\nA second line.\n\n"
+    + "word " * 400
+    + "\n\n"
+    + "x" * 1500
+    + "\n\nLast paragraph."
+)
+
+
+class TestLiteralTextSplitter:
+    """Test the regex-free recursive splitter."""
+
+    @pytest.mark.parametrize("keep_separator", [True, False, "start", "end"])
+    @pytest.mark.parametrize("chunk_size,chunk_overlap", [(1000, 200), (40, 10)])
+    def test_matches_langchain_splitter(
+        self, keep_separator, chunk_size, chunk_overlap
+    ):
+        """Chunks are identical to RecursiveCharacterTextSplitter's."""
+        kwargs = {
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "keep_separator": keep_separator,
+        }
+        expected = RecursiveCharacterTextSplitter(**kwargs).split_text(SAMPLE_TEXT)
+
+        assert LiteralTextSplitter(**kwargs).split_text(SAMPLE_TEXT) == expected
+
+
+class TestProcessDocument:
+    """Test upload processing."""
+
+    @pytest.mark.asyncio
+    async def test_unsupported_type_is_rejected_before_storage(self):
+        """Unsupported files fail without being uploaded to MinIO."""
+        file = UploadFile(
+            file=io.BytesIO(b"\x89PNG"),
+            filename="image.png",
+            headers=Headers({"content-type": "image/png"}),
+        )
+        with patch(
+            "ragbackend.services.document_processor.get_minio_service"
+        ) as get_minio_service:
+            with pytest.raises(ValueError, match="image/png"):
+                await process_document(
+                    file, user_id="user", collection_id="collection"
+                )
+
+        get_minio_service.assert_not_called()
+
+
+class TestParsePool:
+    """Test the parsing process pool."""
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_is_replaced(self):
+        """A pool whose worker died is discarded instead of reused."""
+        broken = MagicMock()
+        fresh = MagicMock()
+        pools = iter([broken, fresh])
+
+        def run_in_executor(pool, func, *args):
+            future = asyncio.get_running_loop().create_future()
+            if pool is broken:
+                future.set_exception(BrokenProcessPool("worker died"))
+            else:
+                future.set_result(func(*args))
+            return future
+
+        loop = asyncio.get_running_loop()
+        blob = Blob(data=b"hello", mimetype="text/plain")
+        with patch.object(
+            document_processor,
+            "ProcessPoolExecutor",
+            side_effect=lambda **_: next(pools),
+        ), patch.object(document_processor, "_parse_pool", None), patch.object(
+            loop, "run_in_executor", side_effect=run_in_executor
+        ):
+            first = await document_processor._parse_and_split_off_loop(blob)
+            broken.shutdown.assert_called_once()
+            assert document_processor._parse_pool is None
+
+            second = await document_processor._parse_and_split_off_loop(blob)
+            assert document_processor._parse_pool is fresh
+
+        assert [doc.page_content for doc in first] == ["hello"]
+        assert [doc.page_content for doc in second] == ["hello"]
@@ -239,10 +239,10 @@ class TestDependencyImports:
         from jose import jwt
         assert jwt is not None
 
-    def test_import_passlib(self):
-        """Test importing passlib."""
-        from passlib.context import CryptContext
-        assert CryptContext is not None
+    def test_import_argon2(self):
+        """Test importing argon2-cffi."""
+        from argon2 import PasswordHasher
+        assert PasswordHasher is not None
 
     def test_import_langchain(self):
         """Test importing LangChain core."""
@@ -0,0 +1,63 @@
+"""Ingest cache tests."""
+
+import base64
+import os
+
+import pytest
+from langchain_core.documents import Document
+
+from ragbackend import config
+from ragbackend.services import ingest_cache
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    path = tmp_path / "ingest"
+    monkeypatch.setattr(config, "INGEST_CACHE_PATH", str(path))
+    monkeypatch.setattr(config, "INGEST_CACHE_MAX_MB", 1)
+    return path
+
+
+class TestIngestCache:
+    """Test the on-disk cache of split uploads."""
+
+    def test_disabled_without_path(self, monkeypatch):
+        """The cache is off unless a path is configured."""
+        monkeypatch.setattr(config, "INGEST_CACHE_PATH", "")
+        assert not ingest_cache.is_enabled()
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, cache_path):
+        """Stored chunks come back with the same content and metadata."""
+        docs = [Document(page_content="chunk", metadata={"page": 1})]
+        await ingest_cache.cache_documents(b"key", docs)
+
+        assert await ingest_cache.get_cached_documents(b"key") == docs
+
+    @pytest.mark.asyncio
+    async def test_miss(self, cache_path):
+        """Unknown keys are a miss."""
+        assert await ingest_cache.get_cached_documents(b"missing") is None
+
+    @pytest.mark.asyncio
+    async def test_unencodable_metadata_is_not_cached(self, cache_path):
+        """Chunks that cannot be stored as JSON are skipped, not pickled."""
+        docs = [Document(page_content="chunk", metadata={"obj": object()})]
+        await ingest_cache.cache_documents(b"key", docs)
+
+        assert await ingest_cache.get_cached_documents(b"key") is None
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entries_are_evicted(self, cache_path):
+        """The directory is trimmed to the size cap, oldest entries first."""
+        # Random base64 barely compresses, so each entry takes about 450 KB
+        content = base64.b64encode(os.urandom(450 * 1024)).decode()
+        docs = [Document(page_content=content)]
+        await ingest_cache.cache_documents(b"old", docs)
+        await ingest_cache.cache_documents(b"new", docs)
+        os.utime(cache_path / (b"old".hex() + ".json.z"), (0, 0))
+        await ingest_cache.cache_documents(b"newest", docs)
+
+        assert await ingest_cache.get_cached_documents(b"old") is None
+        assert await ingest_cache.get_cached_documents(b"new") == docs
+        assert await ingest_cache.get_cached_documents(b"newest") == docs
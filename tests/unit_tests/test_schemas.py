@@ -0,0 +1,59 @@
+"""Schema tests."""
+
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from ragbackend.schemas.collection import CollectionResponse
+from ragbackend.schemas.document import DocumentUpdate, SearchQuery
+
+
+class TestPackedVector:
+    """Test the packed float32 embedding encoding."""
+
+    def test_round_trip(self):
+        """Embeddings serialize to base64 and decode back to the same floats."""
+        vector = [0.5, -1.25, 3.0, 0.0]
+        payload = DocumentUpdate(embedding=vector).model_dump_json()
+
+        assert "[" not in payload
+        assert DocumentUpdate.model_validate_json(payload).embedding == vector
+
+    def test_accepts_plain_list(self):
+        """A JSON array of floats is still accepted on input."""
+        update = DocumentUpdate.model_validate_json('{"embedding": [1.0, 2.0]}')
+        assert update.embedding == [1.0, 2.0]
+
+    def test_none_is_preserved(self):
+        """A missing embedding stays null."""
+        assert DocumentUpdate().model_dump()["embedding"] is None
+
+    def test_rejects_invalid_base64(self):
+        """Malformed packed vectors are reported as validation errors."""
+        with pytest.raises(ValidationError):
+            DocumentUpdate(embedding="not base64!")
+
+
+class TestUuidFields:
+    """Test UUID-valued response fields."""
+
+    def test_uuid_serializes_like_str(self):
+        """UUID and str inputs produce the same JSON."""
+        value = uuid4()
+        from_uuid = CollectionResponse(uuid=value, name="c").model_dump_json()
+        from_str = CollectionResponse(uuid=str(value), name="c").model_dump_json()
+
+        assert from_uuid == from_str
+
+
+class TestSearchQuery:
+    """Test search request validation."""
+
+    def test_limit_is_bounded(self):
+        """Limits pgvector cannot serve are rejected instead of failing the search."""
+        assert SearchQuery(query="q", limit=1000).limit == 1000
+        with pytest.raises(ValidationError):
+            SearchQuery(query="q", limit=1001)
+        with pytest.raises(ValidationError):
+            SearchQuery(query="q", limit=0)
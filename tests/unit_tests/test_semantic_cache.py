@@ -0,0 +1,67 @@
+"""Semantic search cache tests."""
+
+from unittest.mock import patch
+
+from ragbackend import config
+from ragbackend.services import semantic_cache
+from ragbackend.services.semantic_cache import SemanticCache
+
+
+class TestSemanticCache:
+    """Test the nearest-neighbour cache of search results."""
+
+    def test_disabled_with_zero_size(self, monkeypatch):
+        """The cache is off when its size is 0."""
+        monkeypatch.setattr(config, "SEMANTIC_CACHE_SIZE", 0)
+        assert not semantic_cache.is_enabled()
+
+    def test_similar_query_hits(self):
+        """A query close enough to a cached one is answered from the cache."""
+        cache = SemanticCache(capacity=4, threshold=0.97, ttl=60)
+        cache.put([1.0, 0.0], k=2, value=["a", "b"])
+
+        assert cache.get([2.0, 0.01], k=2) == ["a", "b"]
+
+    def test_dissimilar_query_misses(self):
+        """A query below the similarity threshold is a miss."""
+        cache = SemanticCache(capacity=4, threshold=0.97, ttl=60)
+        cache.put([1.0, 0.0], k=2, value=["a", "b"])
+
+        assert cache.get([1.0, 1.0], k=2) is None
+
+    def test_entry_answers_smaller_k_only(self):
+        """Cached results are trimmed for smaller k and never stretched for larger."""
+        cache = SemanticCache(capacity=4, threshold=0.97, ttl=60)
+        cache.put([1.0, 0.0], k=2, value=["a", "b"])
+
+        assert cache.get([1.0, 0.0], k=1) == ["a"]
+        assert cache.get([1.0, 0.0], k=3) is None
+
+    def test_expired_entries_miss(self):
+        """Entries are not served after their TTL."""
+        cache = SemanticCache(capacity=4, threshold=0.97, ttl=60)
+        with patch("ragbackend.services.semantic_cache.time.monotonic", return_value=0):
+            cache.put([1.0, 0.0], k=1, value=["a"])
+        with patch("ragbackend.services.semantic_cache.time.monotonic", return_value=61):
+            assert cache.get([1.0, 0.0], k=1) is None
+
+    def test_least_recently_used_is_evicted(self):
+        """A full cache replaces the entry that was used longest ago."""
+        cache = SemanticCache(capacity=2, threshold=0.97, ttl=60)
+        cache.put([1.0, 0.0], k=1, value=["x"])
+        cache.put([0.0, 1.0], k=1, value=["y"])
+        cache.get([1.0, 0.0], k=1)
+
+        cache.put([-1.0, 0.0], k=1, value=["z"])
+
+        assert cache.get([1.0, 0.0], k=1) == ["x"]
+        assert cache.get([0.0, 1.0], k=1) is None
+        assert cache.get([-1.0, 0.0], k=1) == ["z"]
+
+    def test_clear(self):
+        """Cleared entries are no longer served."""
+        cache = SemanticCache(capacity=2, threshold=0.97, ttl=60)
+        cache.put([1.0, 0.0], k=1, value=["x"])
+        cache.clear()
+
+        assert cache.get([1.0, 0.0], k=1) is None